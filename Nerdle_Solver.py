@@ -1,9 +1,29 @@
+import time
+
+# Taken before the remaining imports so module load time covers them too.
+_MODULE_LOAD_START = time.perf_counter()
+
+import hashlib
+import json
+import math
+import os
 import random
-from collections import Counter
-import tkinter as tk
-from tkinter import messagebox
+import re
+import sys
+import weakref
+from collections import Counter, OrderedDict, deque
+
+# Heavier modules (argparse, concurrent.futures, subprocess, socket,
+# socketserver, threading, tracemalloc) are imported inside the functions
+# that use them, so a plain import stays cheap; `benchmark` measures it.
+# tkinter is only imported when the GUI is launched (see _import_tk), so
+# headless simulation / batch runs never pay for it or fail without it.
+tk = None
+messagebox = None
 
 
+EQUATION_SYMBOLS = set("0123456789+-*/=")
+
 START_GUESS = "3*4+5=17" 
 """
 Solver uses a hardcoded starting guess
@@ -12,24 +32,343 @@ main thing is you don't have repeating symbols and numbers in the starter so you
 """
 
 
-def startup(filename="NerdleClassicRestricted.txt"):
+def startup(filename="NerdleClassicRestricted.txt", weights_file=None,
+            with_weights=False, validate=True, length=None):
     """
     Loads the list of all valid Nerdle equations from a text file.
     Returns them as a list of strings.
+
+    Optional prior weights (how likely each equation is to be the daily
+    answer) can come from a second column in the same file
+    ("3*4+5=17 2.5") or from a sidecar `weights_file` with the same
+    "equation weight" layout; sidecar values win. Equations without a
+    weight get 1.0. Sidecar lines that match no loaded equation (typos,
+    another list) are counted in a warning on stderr.
+
+    With `with_weights=True`, returns (answers, weights) instead, where
+    weights is a dict equation -> weight, or None if no loaded equation was
+    given a weight (uniform prior, i.e. the original behavior).
+
+    With `validate=True`, every equation is checked (see validate_equations)
+    the first time a given file is loaded, and the result is cached in a
+    manifest next to it. Later loads of the same bytes reuse the manifest,
+    and invalid or duplicate lines are skipped with a warning. Diagnostics
+    go to stderr so stdout-based modes (batch) stay clean. `length` is the
+    expected equation length; by default it comes from the stored manifest
+    or the first equation (see list_length), so variant lists work too.
     """
-    answers = []
+    entries = []  # (line number, equation)
+    weights = {}
+    sidecar = set()  # equations given a weight by weights_file
 
     try:
-        with open(filename, "r") as f:
-            for line in f:
-                eq = line.strip()
-                if eq:
-                    answers.append(eq)
-    except FileNotFoundError:
-        print(f"Error: Could not find file '{filename}'.")
-        return []
+        with open(filename, "rb") as f:
+            data = f.read()
+
+        for lineno, line in enumerate(data.decode().splitlines(), start=1):
+            parts = line.split()
+            if not parts:
+                continue
+            entries.append((lineno, parts[0]))
+            if len(parts) > 1:
+                weights[parts[0]] = parts[1]
+
+        if weights_file is not None:
+            with open(weights_file, "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        weights[parts[0]] = parts[1]
+                        sidecar.add(parts[0])
+
+    except FileNotFoundError as exc:
+        print(f"Error: Could not find file '{exc.filename}'.", file=sys.stderr)
+        return ([], None) if with_weights else []
+
+    if validate:
+        if length is None:
+            length = list_length(filename, entries)
+        manifest = load_or_build_manifest(filename, entries, length=length)
+        rejected = {r["line"] for r in manifest["rejected"]}
+        if rejected:
+            print(f"Warning: skipping {len(rejected)} invalid or duplicate "
+                  f"equations in '{filename}' (see {manifest_path(filename)}).",
+                  file=sys.stderr)
+            entries = [(n, eq) for n, eq in entries if n not in rejected]
+
+    answers = [eq for _, eq in entries]
+
+    if weights_file is not None:
+        matched = len(sidecar.intersection(answers))
+        if not sidecar:
+            print(f"Warning: no 'equation weight' lines in '{weights_file}'.",
+                  file=sys.stderr)
+        elif matched < len(sidecar):
+            print(f"Warning: {len(sidecar) - matched} of {len(sidecar)} weights in "
+                  f"'{weights_file}' match no loaded equation "
+                  f"({matched} matched).", file=sys.stderr)
+
+    if not with_weights:
+        return answers
+
+    # Weights only for equations that were not loaded are no prior at all.
+    if not any(eq in weights for eq in answers):
+        return answers, None
+
+    try:
+        weights = {eq: parse_weight(weights.get(eq, 1.0)) for eq in answers}
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return [], None
+
+    if answers and sum(weights.values()) <= 0:
+        print("Error: prior weights sum to zero.", file=sys.stderr)
+        return [], None
+
+    return answers, weights
+
+
+def parse_weight(value):
+    """
+    Convert one weight entry to a float, rejecting negative / non-finite
+    values (a bad prior silently skews every weighted statistic).
+    """
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid weight '{value}'")
+    if not math.isfinite(weight) or weight < 0:
+        raise ValueError(f"invalid weight '{value}'")
+    return weight
+
+# ---------------------------------------------------------------------
+# Answer list validation and integrity manifest
+# ---------------------------------------------------------------------
+
+MANIFEST_VERSION = 2
+
+# Lists at least this long are validated across processes by startup().
+PARALLEL_VALIDATION_THRESHOLD = 100_000
+
+_EXPRESSION_RE = re.compile(r"[0-9]+(?:[+\-*/][0-9]+)*")
+_NUMBER_RE = re.compile(r"[0-9]+")
+
+
+def check_equation(eq, length=8):
+    """
+    Check one equation against the Nerdle rules without using eval.
+
+    Returns None if the equation is valid, otherwise a short reason.
+
+    Rules:
+      - exactly `length` characters from 0-9 + - * / =
+      - one '=', an expression on the left and a single number on the right
+      - no leading zeros (a lone 0 is fine), no unary minus
+      - * and / bind tighter than + and -; each * / run is evaluated with
+        exact integer numerator/denominator and must come out whole
+      - the left side must equal the right side
+    """
+    if len(eq) != length:
+        return f"length {len(eq)}, expected {length}"
+    if eq.count("=") != 1:
+        return "needs exactly one '='"
+
+    lhs, rhs = eq.split("=")
+    if not _EXPRESSION_RE.fullmatch(lhs):
+        return "malformed left side"
+    if not _NUMBER_RE.fullmatch(rhs):
+        return "right side must be a single number"
+
+    tokens = re.split(r"([+\-*/])", lhs)
+    for number in tokens[0::2] + [rhs]:
+        if len(number) > 1 and number[0] == "0":
+            return f"leading zero in '{number}'"
+
+    total = 0
+    sign = 1
+    num, den = int(tokens[0]), 1  # current * / term as a fraction
+
+    for op, number in zip(tokens[1::2], tokens[2::2]):
+        value = int(number)
+        if op == "*":
+            num *= value
+        elif op == "/":
+            if value == 0:
+                return "division by zero"
+            den *= value
+        else:
+            if num % den:
+                return "inexact division"
+            total += sign * (num // den)
+            sign = 1 if op == "+" else -1
+            num, den = value, 1
+
+    if num % den:
+        return "inexact division"
+    total += sign * (num // den)
+
+    if total != int(rhs):
+        return f"left side is {total}, right side is {rhs}"
+
+    return None
+
+
+def _check_equation_chunk(chunk, length):
+    return [(lineno, eq, check_equation(eq, length)) for lineno, eq in chunk]
+
+
+def validate_equations(entries, length=8, workers=1, chunk_size=5000):
+    """
+    Validate (line number, equation) pairs.
+
+    Per-equation checks run across `workers` processes when workers > 1;
+    duplicate detection needs the whole list and runs here afterwards.
+
+    Returns a list of {"line", "equation", "reason"} dicts for every
+    rejected line, in file order. The first copy of a duplicate is kept.
+    """
+    chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = pool.map(_check_equation_chunk, chunks,
+                               [length] * len(chunks))
+            checked = [row for rows in checked for row in rows]
+    else:
+        checked = [row for chunk in chunks for row in _check_equation_chunk(chunk, length)]
+
+    rejected = []
+    first_seen = {}
+    for lineno, eq, reason in checked:
+        if reason is None:
+            if eq in first_seen:
+                reason = f"duplicate of line {first_seen[eq]}"
+            else:
+                first_seen[eq] = lineno
+        if reason is not None:
+            rejected.append({"line": lineno, "equation": eq, "reason": reason})
+
+    return rejected
+
+
+def answer_list_key(answers):
+    """
+    Content hash of an equation list: the manifest's "sha256" for the
+    valid equations of a file, and the base of every cache key built on
+    the loaded list (see job_key), so caches go stale when the list does.
+    """
+    return hashlib.sha256("\n".join(answers).encode()).hexdigest()
+
+
+def build_manifest(entries, length=8, workers=1):
+    """
+    Validate a whole answer file and summarise it.
+
+    `entries` are the file's parsed (line number, equation) pairs. The
+    manifest records the answer_list_key of the valid equations, their
+    count, per-form counts and every rejected line.
+    """
+    rejected = validate_equations(entries, length=length, workers=workers)
+    rejected_lines = {r["line"] for r in rejected}
+    valid = [eq for lineno, eq in entries if lineno not in rejected_lines]
+
+    return {
+        "version": MANIFEST_VERSION,
+        "sha256": answer_list_key(valid),
+        "length": length,
+        "count": len(valid),
+        "forms": dict(Counter(form_key(eq) for eq in valid).most_common()),
+        "rejected": rejected,
+    }
+
+
+def manifest_matches(manifest, entries, length=8):
+    """
+    True if `manifest` still describes `entries`: the same lines are
+    rejected (same line numbers and text) and the remaining equations
+    hash to the recorded key.
+    """
+    if manifest.get("length") != length:
+        return False
+
+    by_line = dict(entries)
+    rejected_lines = set()
+    for r in manifest.get("rejected", ()):
+        if by_line.get(r.get("line")) != r.get("equation"):
+            return False
+        rejected_lines.add(r["line"])
+
+    valid = [eq for lineno, eq in entries if lineno not in rejected_lines]
+    return answer_list_key(valid) == manifest.get("sha256")
+
+
+def manifest_path(filename):
+    return filename + ".manifest.json"
+
+
+def read_manifest(filename):
+    """Return the stored manifest for `filename`, or None if missing/unreadable."""
+    try:
+        with open(manifest_path(filename), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_manifest(filename, manifest):
+    """
+    Write the manifest atomically (temp file + rename), since several
+    worker processes may load the same list for the first time at once.
+    Best effort: a read-only directory just means validating again next time.
+    """
+    path = manifest_path(filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def list_length(filename, entries):
+    """
+    Equation length to validate a list at when none is given: the length
+    its stored manifest was built with, else the first equation's length.
+    """
+    manifest = read_manifest(filename)
+    if manifest is not None and isinstance(manifest.get("length"), int):
+        return manifest["length"]
+    return len(entries[0][1]) if entries else 8
+
+
+def load_or_build_manifest(filename, entries, length=8, workers=None,
+                           force=False):
+    """
+    Return the manifest for these file entries, validating only if the
+    stored manifest is missing or no longer matches (manifest_matches).
+    """
+    if not force:
+        manifest = read_manifest(filename)
+        if manifest is not None and manifest_matches(manifest, entries, length):
+            return manifest
+
+    if workers is None:
+        large = len(entries) >= PARALLEL_VALIDATION_THRESHOLD
+        workers = (os.cpu_count() or 1) if large else 1
+
+    manifest = build_manifest(entries, length=length, workers=workers)
+    write_manifest(filename, manifest)
+    return manifest
 
-    return answers
 
 def form_key(eq):
     """
@@ -127,7 +466,12 @@ def filter_candidates(candidates, guess, feedback_str):
     Given a list of candidate equations, a guess, and the feedback pattern
     (G/P/B string), return the subset of candidates that would produce
     exactly the same feedback if they were the secret.
+
+    A CandidateIndex is filtered bucket-by-bucket and returns a new index.
     """
+    if isinstance(candidates, CandidateIndex):
+        return candidates.filter(guess, feedback_str)
+
     new_candidates = []
     for secret in candidates:
         fb = compute_feedback(secret, guess)
@@ -136,6 +480,474 @@ def filter_candidates(candidates, guess, feedback_str):
     return new_candidates
 
 
+def form_matches_feedback(form, guess, feedback_str):
+    """
+    Check whether equations of shape `form` (see form_key) could possibly
+    produce `feedback_str` for `guess`, using only the operator / '='
+    layout. False means no equation of that form can match, so the whole
+    bucket can be dropped without looking at its equations.
+
+    Operators and '=' are fully determined by the form, so:
+      - a green digit needs a digit slot, a green symbol needs that symbol,
+      - a non-green symbol cannot sit in a slot holding that symbol,
+      - greens + purples of a symbol = min(count in guess, count in secret),
+        and any black copy pins the secret count exactly.
+    """
+    symbol_hits = Counter()
+    symbol_black = set()
+
+    for gch, fch, f in zip(guess, form, feedback_str):
+        if gch.isdigit():
+            if f == "G" and fch != "D":
+                return False
+            continue
+
+        if f == "G":
+            if fch != gch:
+                return False
+        elif fch == gch:
+            return False
+
+        if f == "B":
+            symbol_black.add(gch)
+        else:
+            symbol_hits[gch] += 1
+
+    for sym in symbol_black:
+        if form.count(sym) != symbol_hits[sym]:
+            return False
+    for sym, hits in symbol_hits.items():
+        if form.count(sym) < hits:
+            return False
+
+    return True
+
+
+class CandidateIndex:
+    """
+    Candidate equations grouped into buckets by form_key.
+
+    Filtering first rejects whole buckets whose form cannot fit the
+    operator / '=' feedback (form_matches_feedback), then runs
+    compute_feedback only on equations in the surviving buckets. Early
+    guesses usually pin down the shape, so most of the list is skipped.
+
+    Per-bucket statistics are kept alongside the equations and updated
+    incrementally on every filter:
+      - symbol_counts[form]: Counter of every symbol across the bucket
+      - form_weights[form]:  total prior weight (only when weights given)
+
+    Instances are never modified after construction, so buckets that
+    survive a filter untouched are shared with the parent index, and one
+    index built from the answer list can seed any number of games.
+
+    An index with a `cache_key` (see build_answer_index) looks its filter
+    results up in FILTER_CACHE first; large results inherit a key so the
+    next level down is cached too.
+    """
+
+    def __init__(self, weights=None):
+        self.weights = weights
+        self.buckets = {}        # form_key -> list of equations
+        self.symbol_counts = {}  # form_key -> Counter of symbols
+        self.form_weights = {}   # form_key -> summed prior weight
+        self.size = 0
+        self.cache_key = None
+
+    @classmethod
+    def from_answers(cls, answers, weights=None):
+        index = cls(weights)
+        buckets = {}
+        for eq in answers:
+            buckets.setdefault(form_key(eq), []).append(eq)
+
+        for fk, eqs in buckets.items():
+            weight = sum(weights[eq] for eq in eqs) if weights is not None else None
+            index._add_bucket(fk, eqs, Counter("".join(eqs)), weight)
+        return index
+
+    def _add_bucket(self, fk, eqs, symbol_counts, weight):
+        self.buckets[fk] = eqs
+        self.symbol_counts[fk] = symbol_counts
+        if weight is not None:
+            self.form_weights[fk] = weight
+        self.size += len(eqs)
+
+    def _add_filtered_bucket(self, parent, fk, kept, removed=None):
+        """
+        Add `parent`'s bucket `fk` reduced to `kept`, updating its
+        statistics from whichever side is smaller. `removed` may be left
+        out; it is then rebuilt only if it is the smaller side.
+        """
+        eqs = parent.buckets[fk]
+        weight = parent.form_weights.get(fk)
+
+        if len(kept) == len(eqs):
+            self._add_bucket(fk, eqs, parent.symbol_counts[fk], weight)
+            return
+
+        if len(eqs) - len(kept) < len(kept):
+            if removed is None:
+                kept_set = set(kept)
+                removed = [eq for eq in eqs if eq not in kept_set]
+            symbol_counts = parent.symbol_counts[fk].copy()
+            symbol_counts.subtract("".join(removed))
+            symbol_counts = +symbol_counts  # drop zero entries
+            if weight is not None:
+                weight = max(0.0, weight - sum(parent.weights[eq] for eq in removed))
+        else:
+            symbol_counts = Counter("".join(kept))
+            if weight is not None:
+                weight = sum(parent.weights[eq] for eq in kept)
+
+        self._add_bucket(fk, kept, symbol_counts, weight)
+
+    def nbytes(self):
+        """
+        Approximate memory held by this index's own containers. Equation
+        strings are owned by the answer list and are not counted.
+        """
+        total = sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+        total += sys.getsizeof(self.buckets) + sys.getsizeof(self.symbol_counts)
+        total += sys.getsizeof(self.form_weights)
+        for fk, eqs in self.buckets.items():
+            total += sys.getsizeof(eqs) + sys.getsizeof(self.symbol_counts[fk])
+        total += 24 * len(self.form_weights)  # float values
+        return total
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for eqs in self.buckets.values():
+            yield from eqs
+
+    def __contains__(self, eq):
+        return eq in self.buckets.get(form_key(eq), ())
+
+    def equations(self):
+        return list(self)
+
+    def form_mass(self, weights=None):
+        """
+        Return form_key -> count, or form_key -> summed weight if weights
+        are given (cached sums are used when they match the index's own).
+        """
+        if weights is None:
+            return {fk: len(eqs) for fk, eqs in self.buckets.items()}
+        if weights is self.weights:
+            return self.form_weights
+        return {fk: sum(weights[eq] for eq in eqs)
+                for fk, eqs in self.buckets.items()}
+
+    def filter(self, guess, feedback_str):
+        """
+        Return a new index holding only the equations that would produce
+        `feedback_str` for `guess` (same result as filter_candidates).
+        """
+        if self.cache_key is None:
+            return self._filter(guess, feedback_str)
+
+        key = (self.cache_key, guess, feedback_str)
+        result = FILTER_CACHE.get(key)
+        if result is None:
+            result = self._filter(guess, feedback_str)
+            if len(result) >= FILTER_CACHE_MIN_SIZE:
+                result.cache_key = key
+            FILTER_CACHE.put(key, result)
+        return result
+
+    def _filter(self, guess, feedback_str):
+        result = CandidateIndex(self.weights)
+
+        for fk, eqs in self.buckets.items():
+            if not form_matches_feedback(fk, guess, feedback_str):
+                continue
+
+            kept = []
+            removed = []
+            for eq in eqs:
+                if compute_feedback(eq, guess) == feedback_str:
+                    kept.append(eq)
+                else:
+                    removed.append(eq)
+
+            if kept:
+                result._add_filtered_bucket(self, fk, kept, removed)
+
+        return result
+
+    def partition(self, guess):
+        """
+        Split the index by the feedback each equation would give for
+        `guess`, in one pass: feedback -> index equal to filter(guess, fb).
+        """
+        parts = {}  # feedback -> form_key -> kept equations
+        for fk, eqs in self.buckets.items():
+            for eq in eqs:
+                fb = compute_feedback(eq, guess)
+                parts.setdefault(fb, {}).setdefault(fk, []).append(eq)
+
+        result = {}
+        for fb, buckets in parts.items():
+            child = CandidateIndex(self.weights)
+            for fk, kept in buckets.items():
+                child._add_filtered_bucket(self, fk, kept)
+            result[fb] = child
+        return result
+
+
+def as_candidate_index(candidates, weights=None):
+    """Wrap a plain list of equations in a CandidateIndex (indexes pass through)."""
+    if isinstance(candidates, CandidateIndex):
+        return candidates
+    return CandidateIndex.from_answers(candidates, weights)
+
+
+# ---------------------------------------------------------------------
+# Memory accounting, filter cache and budget
+# ---------------------------------------------------------------------
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes, per process
+
+# Every filter result is cached under its parent's key (the pass over the
+# parent is the expensive part), but results smaller than this get no
+# cache_key of their own: filtering them further is cheap, so those
+# second-level results are recomputed instead of cached.
+FILTER_CACHE_MIN_SIZE = 100
+
+
+class FilterCache:
+    """
+    LRU cache of CandidateIndex.filter results, bounded by a byte budget
+    (CandidateIndex.nbytes). Inserting past the budget evicts the least
+    recently used entries; a budget of 0 disables caching entirely.
+    """
+
+    def __init__(self, budget=DEFAULT_MEMORY_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()  # key -> (CandidateIndex, nbytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def fits(self, nbytes):
+        return self.budget is None or self.nbytes + nbytes <= self.budget
+
+    def put(self, key, index, evict=True):
+        """
+        Store `index` under `key`. With evict=False the entry is only
+        stored if it fits without pushing anything else out.
+        Returns True if the entry was stored.
+        """
+        if key in self.entries:
+            return True
+
+        nbytes = index.nbytes()
+        if self.budget is not None and nbytes > self.budget:
+            return False
+        if not evict and not self.fits(nbytes):
+            return False
+
+        self.entries[key] = (index, nbytes)
+        self.nbytes += nbytes
+        self._evict()
+        return True
+
+    def _evict(self):
+        while self.budget is not None and self.nbytes > self.budget and self.entries:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.nbytes -= nbytes
+            self.evictions += 1
+
+    def set_budget(self, budget):
+        self.budget = budget
+        self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "bytes": self.nbytes,
+            "budget": self.budget,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+FILTER_CACHE = FilterCache()
+
+# owner name -> the candidate set it is currently working on. Weak, so
+# finished games drop out on their own.
+_LIVE_CANDIDATES = weakref.WeakValueDictionary()
+
+# Peak sizes cost an nbytes() call per turn, so they are only recorded
+# while enabled (run_memory_report turns this on for its run).
+_PEAK_TRACKING = False
+_PEAK_CANDIDATE_BYTES = Counter()
+
+
+def set_memory_budget(nbytes):
+    """
+    Set the per-process byte budget for solver caches (None = unlimited,
+    0 = no caching). Shrinking the budget evicts immediately.
+    """
+    FILTER_CACHE.set_budget(nbytes)
+
+
+def set_peak_tracking(enabled):
+    """Turn recording of peak candidate-set sizes on or off."""
+    global _PEAK_TRACKING
+    _PEAK_TRACKING = enabled
+
+
+def track_candidates(owner, index):
+    """
+    Register the candidate set `owner` is using, for memory_report().
+    Cheap (a weak reference) unless peak tracking is enabled.
+    """
+    _LIVE_CANDIDATES[owner] = index
+    if _PEAK_TRACKING:
+        nbytes = index.nbytes()
+        if nbytes > _PEAK_CANDIDATE_BYTES[owner]:
+            _PEAK_CANDIDATE_BYTES[owner] = nbytes
+
+
+def precompute_partition(index, guess):
+    """
+    Fill FILTER_CACHE with every filter result of `index` for `guess`
+    (the opening-move table: one feedback pass instead of one filter per
+    game). Entries go in only while they fit the budget without evicting
+    anything; the rest stay on-demand.
+
+    Returns (entries cached, feedback patterns in total).
+    """
+    if index.cache_key is None or guess not in index:
+        return 0, 0
+    if FILTER_CACHE.budget is not None and FILTER_CACHE.budget <= 0:
+        return 0, 0
+
+    parts = index.partition(guess)
+    cached = 0
+    for fb, child in parts.items():
+        key = (index.cache_key, guess, fb)
+        if len(child) >= FILTER_CACHE_MIN_SIZE:
+            child.cache_key = key
+        if FILTER_CACHE.put(key, child, evict=False):
+            cached += 1
+    return cached, len(parts)
+
+
+def build_answer_index(all_answers, weights=None, precompute=True):
+    """
+    Build the shared, cache-keyed CandidateIndex every game starts from.
+    With `precompute`, the START_GUESS partition is cached up front.
+    """
+    index = CandidateIndex.from_answers(all_answers, weights)
+    index.cache_key = job_key(all_answers, weights)
+    track_candidates("answer_index", index)
+    if precompute:
+        precompute_partition(index, START_GUESS)
+    return index
+
+
+def deep_sizeof(obj):
+    """
+    Total size of `obj` and everything reachable through containers
+    (and CandidateIndex attributes), counting shared objects once.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif isinstance(item, CandidateIndex):
+            stack.append(item.__dict__)
+
+    return total
+
+
+def memory_report(all_answers=None, weights=None):
+    """
+    Bytes used by the solver's data structures in this process.
+
+    Returns a dict with:
+      - "answers" / "weights": the loaded list and prior (incl. strings)
+      - "candidates": owner -> {"live": bytes or None, "peak": bytes or None}
+        for answer_index, simulate_single_game, NerdleGUI, ...
+        (peaks only exist for owners seen while peak tracking was on)
+      - "filter_cache": FilterCache.stats()
+    """
+    report = {
+        "answers": deep_sizeof(all_answers) if all_answers is not None else 0,
+        "weights": deep_sizeof(weights) if weights is not None else 0,
+        "candidates": {},
+        "filter_cache": FILTER_CACHE.stats(),
+    }
+
+    owners = set(_PEAK_CANDIDATE_BYTES) | set(_LIVE_CANDIDATES.keys())
+    for owner in sorted(owners):
+        live = _LIVE_CANDIDATES.get(owner)
+        report["candidates"][owner] = {
+            "live": live.nbytes() if live is not None else None,
+            "peak": _PEAK_CANDIDATE_BYTES.get(owner),
+        }
+
+    return report
+
+
+def _format_bytes(nbytes):
+    if nbytes is None:
+        return "--"
+    for unit in ("B", "KiB", "MiB"):
+        if nbytes < 1024 or unit == "MiB":
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+
+def print_memory_report(report):
+    print("Memory usage:")
+    print(f"  Answer list     : {_format_bytes(report['answers'])}")
+    if report["weights"]:
+        print(f"  Prior weights   : {_format_bytes(report['weights'])}")
+
+    print("  Candidate sets (live / peak, excluding shared strings):")
+    for owner, sizes in report["candidates"].items():
+        print(f"    {owner:<20}: {_format_bytes(sizes['live'])} / "
+              f"{_format_bytes(sizes['peak'])}")
+
+    cache = report["filter_cache"]
+    budget = "unlimited" if cache["budget"] is None else _format_bytes(cache["budget"])
+    print(f"  Filter cache    : {_format_bytes(cache['bytes'])} of {budget} "
+          f"({cache['entries']} entries, {cache['hits']} hits, "
+          f"{cache['misses']} misses, {cache['evictions']} evictions)")
+
+
 def get_feedback_from_user():
     """
     Ask the user to type an 8-character string of G/P/B (green, purple, black)
@@ -148,7 +960,19 @@ def get_feedback_from_user():
         print("Invalid feedback. Please enter exactly 8 characters of G, P, or B.")
 
 
-def choose_guess(candidates, turn_number, seen_symbols):
+def pick_likely(eqs, weights=None):
+    """
+    Pick one equation from `eqs`: uniformly at random without a prior,
+    otherwise at random among the highest-weight ones (the single most
+    likely answer is the greedy best guess under the prior).
+    """
+    if weights is None:
+        return random.choice(eqs)
+    best = max(weights[eq] for eq in eqs)
+    return random.choice([eq for eq in eqs if weights[eq] == best])
+
+
+def choose_guess(candidates, turn_number, seen_symbols, weights=None):
     """
     Choose the next guess.
 
@@ -162,22 +986,30 @@ def choose_guess(candidates, turn_number, seen_symbols):
       - When the candidate set is small:
           * stop being fancy and just pick randomly among candidates.
             At that point, all remaining forms are very similar anyway.
+
+    With `weights` (equation -> prior weight), form frequencies become
+    probability mass under the prior, and random picks become picks of the
+    most likely candidate.
+
+    `candidates` may be a list or a CandidateIndex; form frequencies are
+    read from the index buckets instead of being recomputed.
     """
+    index = as_candidate_index(candidates, weights)
 
     # -------------------------------
     # First move: use your hard-coded start if possible.
     # -------------------------------
     if turn_number == 1:
-        if START_GUESS in candidates:
+        if START_GUESS in index:
             return START_GUESS
         # Fall back to a random candidate if START_GUESS isn't valid.
-        return random.choice(candidates)
+        return pick_likely(index.equations(), weights)
 
     # -------------------------------
     # Late-game: when few candidates remain, just guess among them.
     # -------------------------------
-    if len(candidates) <= 10:
-        return random.choice(candidates)
+    if len(index) <= 10:
+        return pick_likely(index.equations(), weights)
 
     # -------------------------------
     # Early / mid-game: 
@@ -189,41 +1021,41 @@ def choose_guess(candidates, turn_number, seen_symbols):
     #       - distinct    = how many distinct symbols it uses total
     # 3. Combine these into a score and pick a max-scoring candidate.
     # -------------------------------
-    total = len(candidates)
-    form_counts = Counter(form_key(eq) for eq in candidates)  # form_key -> count
+    # form_key -> count (or prior mass when weighted), one entry per bucket
+    form_counts = index.form_mass(weights)
+    total = sum(form_counts.values()) or 1.0
 
     best_score = float("-inf")
     best_eqs = []
 
-    for eq in candidates:
-        chars = set(eq)
-        distinct = len(chars)
-
-        # Symbols in this equation that have not appeared in any previous guesses.
-        new_symbols = len(chars - seen_symbols)
-
+    for fk, eqs in index.buckets.items():
         # How likely is this equation "shape" among remaining candidates?
-        fk = form_key(eq)
         form_prob = form_counts[fk] / total  # between 0 and 1
 
-        # Weighting:
-        #   - form_prob: favor likely equation layouts (shape)
-        #   - new_symbols: favor testing unseen symbols (information gain)
-        #   - distinct: favor overall variety
-        score = 3.0 * form_prob + 2.0 * new_symbols + 1.0 * distinct
+        for eq in eqs:
+            chars = set(eq)
+            distinct = len(chars)
+
+            # Symbols in this equation that have not appeared in any previous guesses.
+            new_symbols = len(chars - seen_symbols)
 
-        if score > best_score:
-            best_score = score
-            best_eqs = [eq]
-        elif score == best_score:
-            best_eqs.append(eq)
+            # Weighting:
+            #   - form_prob: favor likely equation layouts (shape)
+            #   - new_symbols: favor testing unseen symbols (information gain)
+            #   - distinct: favor overall variety
+            score = 3.0 * form_prob + 2.0 * new_symbols + 1.0 * distinct
 
-    # Break ties randomly among the best-scoring equations.
-    return random.choice(best_eqs) if best_eqs else random.choice(candidates)
+            if score > best_score:
+                best_score = score
+                best_eqs = [eq]
+            elif score == best_score:
+                best_eqs.append(eq)
 
+    # Break ties among the best-scoring equations (randomly, or by prior).
+    return pick_likely(best_eqs, weights) if best_eqs else pick_likely(index.equations(), weights)
 
 
-def solve_puzzle(all_answers):
+def solve_puzzle(all_answers, weights=None):
     """
     Interactive solve mode.
 
@@ -233,9 +1065,9 @@ def solve_puzzle(all_answers):
     seen so far and proposes the next guess.
     """
 
-    # Start with the full answer list as possible candidates.
-    # This list will shrink after each guess based on feedback.
-    candidates = all_answers[:]
+    # Start with the full answer list as possible candidates, grouped
+    # by form. This shrinks after each guess based on feedback.
+    candidates = as_candidate_index(all_answers, weights)
 
     # Guess counter (1-based, like the actual game)
     turn = 1
@@ -256,7 +1088,7 @@ def solve_puzzle(all_answers):
             return
 
         # Choose the next guess using the heuristic
-        guess = choose_guess(candidates, turn, seen_symbols)
+        guess = choose_guess(candidates, turn, seen_symbols, weights)
 
         print(f"\nGuess {turn}: {guess}")
         print("Type this into Nerdle, then enter the feedback here:")
@@ -283,19 +1115,24 @@ def solve_puzzle(all_answers):
         turn += 1
 
 
-def simulate_single_game(secret, all_answers, verbose=False):
+def simulate_single_game(secret, all_answers, verbose=False, history=None,
+                         weights=None):
     """
     Simulate solving a single Nerdle puzzle automatically.
 
     - `secret` is the true answer.
     - No user input is required.
     - Feedback is computed internally using compute_feedback().
+    - If `history` is a list, each (guess, feedback) pair is appended to it.
+    - `weights` is an optional prior passed through to choose_guess().
+    - `all_answers` may be a prebuilt CandidateIndex, which avoids
+      re-bucketing the answer list for every game.
     - Returns the number of guesses needed to solve the puzzle,
       or None if something goes wrong.
     """
 
     # Start with all answers as possible candidates
-    candidates = all_answers[:]
+    candidates = as_candidate_index(all_answers, weights)
     turn = 1
 
     # Track which symbols have appeared in guesses so far
@@ -312,8 +1149,10 @@ def simulate_single_game(secret, all_answers, verbose=False):
                 print("Error: no candidates left. Aborting this simulation.")
             return None
 
+        track_candidates("simulate_single_game", candidates)
+
         # Choose the next guess
-        guess = choose_guess(candidates, turn, seen_symbols)
+        guess = choose_guess(candidates, turn, seen_symbols, weights)
 
         # Update seen symbols
         seen_symbols |= set(guess)
@@ -321,6 +1160,9 @@ def simulate_single_game(secret, all_answers, verbose=False):
         # Compute Nerdle-style feedback automatically
         feedback_str = compute_feedback(secret, guess)
 
+        if history is not None:
+            history.append((guess, feedback_str))
+
         if verbose:
             print(
                 f"Guess {turn}: {guess} -> {feedback_str} "
@@ -337,12 +1179,15 @@ def simulate_single_game(secret, all_answers, verbose=False):
         turn += 1
 
 
-def simulate_many_games(all_answers, num_games=100):
+def simulate_many_games(all_answers, num_games=100, weights=None):
     """
     Run the solver on a number of randomly chosen secrets.
 
     This provides a quick estimate of solver performance
     without running a full population-wide simulation.
+
+    With `weights`, secrets are drawn from the prior, so the plain
+    average is an estimate of the expected guesses under that prior.
     """
 
     if not all_answers:
@@ -351,12 +1196,22 @@ def simulate_many_games(all_answers, num_games=100):
 
     results = []
 
+    weight_list = None if weights is None else [weights[eq] for eq in all_answers]
+    if weight_list is not None and sum(weight_list) <= 0:
+        print("All answers have zero prior weight; cannot sample secrets.")
+        return
+    answer_index = build_answer_index(all_answers, weights)
+
     for game_idx in range(1, num_games + 1):
-        # Choose a random secret from the answer list
-        secret = random.choice(all_answers)
+        # Choose a random secret from the answer list (or from the prior)
+        if weight_list is None:
+            secret = random.choice(all_answers)
+        else:
+            secret = random.choices(all_answers, weights=weight_list)[0]
 
         # Simulate solving it
-        guesses = simulate_single_game(secret, all_answers, verbose=False)
+        guesses = simulate_single_game(secret, answer_index, verbose=False,
+                                       weights=weights)
 
         if guesses is None:
             print(f"Game {game_idx}: simulation failed (no candidates).")
@@ -373,41 +1228,67 @@ def simulate_many_games(all_answers, num_games=100):
     best = min(results)
     worst = max(results)
 
-    print(f"\nSimulation over {len(results)} random games:")
+    label = "prior-weighted random" if weights is not None else "random"
+    print(f"\nSimulation over {len(results)} {label} games:")
     print(f"  Average guesses : {avg:.3f}")
     print(f"  Best game       : {best} guesses")
     print(f"  Worst game      : {worst} guesses")
 
 
-def simulate_all_answers(all_answers):
+def simulate_all_answers(all_answers, weights=None, seed=None):
     """
     Run the solver on EVERY possible answer in the list.
 
     This computes the exact (not sampled) performance statistics:
     average guesses, best/worst case, and full distribution.
+    With `weights`, the average and distribution are also reported
+    weighted by the prior (i.e. the expected guesses on a real day).
+    With `seed`, each game is seeded from its secret's position, so the
+    results match a sharded run (see run_coordinator) exactly.
     """
 
     if not all_answers:
         print("No answers loaded; cannot run full simulation.")
         return
 
-    results = []
+    guess_counts = []
+    answer_index = build_answer_index(all_answers, weights)
 
     total_games = len(all_answers)
     print(f"\nRunning full simulation on all {total_games} answers...")
 
     for i, secret in enumerate(all_answers, start=1):
-        guesses = simulate_single_game(secret, all_answers, verbose=False)
+        if seed is not None:
+            random.seed(f"{seed}:{i - 1}")
+
+        guesses = simulate_single_game(secret, answer_index, verbose=False,
+                                       weights=weights)
 
         if guesses is None:
             print(f"Game {i}: simulation failed for secret {secret}.")
-        else:
-            results.append(guesses)
+        guess_counts.append(guesses)
 
         # Periodic progress update so the user knows it's running
         if i % 100 == 0 or i == total_games:
             print(f"  Simulated {i}/{total_games} games...")
 
+    print_full_results(all_answers, guess_counts, weights)
+
+
+def print_full_results(all_answers, guess_counts, weights=None):
+    """
+    Print the statistics for a full simulation.
+
+    `guess_counts[i]` is the number of guesses needed for `all_answers[i]`
+    (None if that game failed).
+    """
+    results = []
+    result_weights = []
+    for secret, guesses in zip(all_answers, guess_counts):
+        if guesses is not None:
+            results.append(guesses)
+            result_weights.append(1.0 if weights is None else weights[secret])
+
     if not results:
         print("No successful simulations.")
         return
@@ -432,6 +1313,26 @@ def simulate_all_answers(all_answers):
         pct = 100.0 * count / len(results)
         print(f"  {guesses} guesses: {count} games ({pct:.2f}%)")
 
+    if weights is None:
+        return
+
+    total_weight = sum(result_weights)
+    if total_weight <= 0:
+        print("\nAll simulated answers have zero prior weight.")
+        return
+
+    weighted_dist = Counter()
+    for guesses, w in zip(results, result_weights):
+        weighted_dist[guesses] += w
+    weighted_avg = sum(g * w for g, w in weighted_dist.items()) / total_weight
+
+    print("\nPrior-weighted results:")
+    print(f"  Expected guesses: {weighted_avg:.3f}")
+    for guesses in sorted(weighted_dist.keys()):
+        pct = 100.0 * weighted_dist[guesses] / total_weight
+        print(f"  {guesses} guesses: {pct:.2f}%")
+
+
 class NerdleGUI:
     """
     A simple GUI for the Nerdle solver.
@@ -444,15 +1345,18 @@ class NerdleGUI:
       to the solver, which then filters candidates and chooses the next guess.
     """
 
-    def __init__(self, root, all_answers, switch_flag):
+    def __init__(self, root, all_answers, switch_flag, weights=None):
         """
         `switch_flag` is a mutable dict used to signal that the user
         wants to switch to CLI simulation mode: {"value": False/True}
+        `weights` is an optional prior over answers (see startup()).
         """
         self.root = root
         self.root.title("Nerdle Solver")
 
         self.all_answers = all_answers
+        self.weights = weights
+        self.answer_index = build_answer_index(all_answers, weights, precompute=False)
         self.switch_flag = switch_flag  # shared flag with outer code
 
         # Solver state
@@ -581,7 +1485,8 @@ class NerdleGUI:
         self.root.bind("<Return>", lambda event: self._on_submit())
 
     def _start_new_game(self):
-        self.candidates = self.all_answers[:]
+        self.candidates = self.answer_index
+        track_candidates("NerdleGUI", self.candidates)
         self.turn = 1
         self.seen_symbols = set()
         self.current_row = 0
@@ -628,7 +1533,8 @@ class NerdleGUI:
         )
         self._update_window_title(f"Turn {self.turn}")
 
-        guess = choose_guess(self.candidates, self.turn, self.seen_symbols)
+        guess = choose_guess(self.candidates, self.turn, self.seen_symbols,
+                             self.weights)
         self.current_guess = guess
         self.current_feedback = ["B"] * self.cols
 
@@ -720,6 +1626,7 @@ class NerdleGUI:
             return
 
         self.candidates = new_candidates
+        track_candidates("NerdleGUI", self.candidates)
 
         # Move to the next row / turn
         self.turn += 1
@@ -752,22 +1659,58 @@ class NerdleGUI:
         self.root.destroy()
 
 
-def run_gui_solver(all_answers):
+def _import_tk():
+    """
+    Import tkinter on first use and bind it to the module-level names
+    the GUI code refers to. Returns False if Tk is not available.
+    """
+    global tk, messagebox
+    if tk is not None:
+        return True
+
+    try:
+        import tkinter
+        from tkinter import messagebox as tk_messagebox
+    except ImportError:
+        return False
+
+    tk = tkinter
+    messagebox = tk_messagebox
+    return True
+
+
+def run_gui_solver(all_answers, weights=None):
+    """
+    Launch the Tk GUI. Returns a process exit code: 1 if the GUI could
+    not start (no tkinter, or no display to open a window on).
+    """
     if not all_answers:
-        print("No answers loaded; cannot launch GUI.")
-        return
+        print("No answers loaded; cannot launch GUI.", file=sys.stderr)
+        return 1
+
+    if not _import_tk():
+        print("tkinter is not available; use the 'solve', 'simulate' or "
+              "'batch' commands instead.", file=sys.stderr)
+        return 1
 
     switch_flag = {"value": False}
 
-    root = tk.Tk()
-    app = NerdleGUI(root, all_answers, switch_flag)
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"Cannot open the GUI ({exc}); use the 'solve', 'simulate' or "
+              "'batch' commands instead.", file=sys.stderr)
+        return 1
+
+    app = NerdleGUI(root, all_answers, switch_flag, weights)
     root.mainloop()
 
     if switch_flag["value"]:
-        cli_simulation_menu(all_answers)
+        cli_simulation_menu(all_answers, weights)
+    return 0
 
 
-def cli_simulation_menu(all_answers):
+def cli_simulation_menu(all_answers, weights=None):
     print(f"\nLoaded {len(all_answers)} Nerdle equations.")
     print("\nSimulation Commands:")
     print("  m = run simulation on random secrets")
@@ -787,10 +1730,10 @@ def cli_simulation_menu(all_answers):
                 except ValueError:
                     print("Invalid number, defaulting to 100.")
                     num_games = 100
-            simulate_many_games(all_answers, num_games=num_games)
+            simulate_many_games(all_answers, num_games=num_games, weights=weights)
 
         elif cmd == "a":
-            simulate_all_answers(all_answers)
+            simulate_all_answers(all_answers, weights)
 
         elif cmd == "q":
             print("Exiting simulation mode.")
@@ -800,15 +1743,1004 @@ def cli_simulation_menu(all_answers):
             print("Unknown command. Type 'm', 'a', or 'q'.\n")
 
 
-def main():
-    all_answers = startup()
+# ---------------------------------------------------------------------
+# Batch mode: stream secrets / transcripts through the solver
+# ---------------------------------------------------------------------
+#
+# Each input line is one record:
+#   - a secret equation, e.g.            3*4+5=17
+#   - a recorded transcript of guesses,  3*4+5=17:BBPGBBPB 9-1*4=5:PBBBGPBB
+#   - or a JSON object with either a "secret" key or a "turns" key
+#     (a list of [guess, feedback] pairs); any "id" key is echoed back.
+#
+# Every record produces exactly one JSON line on the output stream.
 
-    if not all_answers:
-        print("Startup failed — no answers loaded.")
+_batch_answer_set = set()
+_batch_index = None
+_batch_weights = None
+_batch_seed = None
+
+
+def _init_batch_worker(all_answers, seed, weights=None,
+                       memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Per-process setup for batch workers: keep one copy of the answer list
+    (and a set for fast membership checks) instead of shipping it with
+    every task.
+    """
+    global _batch_answer_set, _batch_index, _batch_weights, _batch_seed
+    set_memory_budget(memory_budget)
+    _batch_answer_set = set(all_answers)
+    _batch_index = build_answer_index(all_answers, weights)
+    _batch_weights = weights
+    _batch_seed = seed
+
+
+def parse_batch_record(line):
+    """
+    Turn one input line into a record dict.
+
+    Returns {"secret": ...} or {"turns": [(guess, feedback), ...]},
+    plus "id" if one was given. Raises ValueError on malformed input.
+    """
+    line = line.strip()
+
+    if line.startswith("{"):
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"invalid JSON: {exc.msg}")
+
+        record = {}
+        if "id" in obj:
+            record["id"] = obj["id"]
+        if "secret" in obj:
+            record["secret"] = str(obj["secret"])
+        elif "turns" in obj:
+            try:
+                record["turns"] = [(str(g), str(fb).upper()) for g, fb in obj["turns"]]
+            except (TypeError, ValueError):
+                raise ValueError("'turns' must be a list of [guess, feedback] pairs")
+        else:
+            raise ValueError("record needs a 'secret' or 'turns' key")
+        return record
+
+    tokens = line.split()
+    if len(tokens) == 1 and ":" not in tokens[0]:
+        return {"secret": tokens[0]}
+
+    turns = []
+    for token in tokens:
+        guess, sep, fb = token.partition(":")
+        if not sep:
+            raise ValueError(f"expected GUESS:FEEDBACK, got '{token}'")
+        turns.append((guess, fb.upper()))
+    return {"turns": turns}
+
+
+def replay_transcript(turns, all_answers, weights=None):
+    """
+    Replay recorded (guess, feedback) pairs against the answer list.
+
+    Returns a dict describing the state after the last turn: whether it
+    was solved, how many candidates remain and the solver's next guess.
+
+    Raises ValueError for malformed turns, for a solve on a guess the
+    earlier feedback had ruled out, and for turns after the solve.
+    """
+    candidates = as_candidate_index(all_answers, weights)
+    seen_symbols = set()
+    length = len(next(iter(candidates), ""))
+
+    for turn, (guess, feedback_str) in enumerate(turns, start=1):
+        if len(guess) != length or any(c not in EQUATION_SYMBOLS for c in guess):
+            raise ValueError(f"invalid guess '{guess}'")
+        if len(feedback_str) != length or any(c not in "GPB" for c in feedback_str):
+            raise ValueError(f"invalid feedback '{feedback_str}' for guess '{guess}'")
+
+        seen_symbols |= set(guess)
+
+        if feedback_str == "G" * len(guess):
+            if guess not in candidates:
+                raise ValueError("transcript inconsistent with answer list")
+            if turn != len(turns):
+                raise ValueError(f"turns after the solve on turn {turn}")
+            return {"turns": turn, "solved": True,
+                    "candidates_left": 1, "answer": guess}
+
+        candidates = filter_candidates(candidates, guess, feedback_str)
+
+    result = {"turns": len(turns), "solved": False,
+              "candidates_left": len(candidates)}
+    if candidates:
+        result["next_guess"] = choose_guess(candidates, len(turns) + 1,
+                                            seen_symbols, weights)
+    return result
+
+
+def solve_batch_record(lineno, line):
+    """
+    Process a single batch input line and return its JSON-serialisable result.
+
+    Runs inside a worker process (or inline when workers=1). Errors are
+    reported in the result rather than raised, so one bad line never
+    stops the stream.
+    """
+    result = {"line": lineno}
+
+    # Seed per line so results do not depend on which worker got the line.
+    if _batch_seed is not None:
+        random.seed(f"{_batch_seed}:{lineno}")
+
+    try:
+        record = parse_batch_record(line)
+        if "id" in record:
+            result["id"] = record["id"]
+
+        if "secret" in record:
+            secret = record["secret"]
+            result["secret"] = secret
+            if secret not in _batch_answer_set:
+                raise ValueError("secret is not in the answer list")
+
+            history = []
+            guesses = simulate_single_game(secret, _batch_index, history=history,
+                                           weights=_batch_weights)
+            if guesses is None:
+                raise ValueError("no candidates left")
+            result["guesses"] = guesses
+            result["path"] = [g for g, _ in history]
+        else:
+            result.update(replay_transcript(record["turns"], _batch_index,
+                                            _batch_weights))
+
+    except ValueError as exc:
+        result["error"] = str(exc)
+    except Exception as exc:
+        # Backstop: an unexpected failure on one record is still just
+        # that record's error.
+        result["error"] = f"{type(exc).__name__}: {exc}"
+
+    return result
+
+
+def _solve_batch_chunk(chunk):
+    return [solve_batch_record(lineno, line) for lineno, line in chunk]
+
+
+def _read_batch_chunks(in_stream, chunk_size):
+    """
+    Yield lists of (line number, line) pairs, skipping blank lines.
+    Only one chunk is held in memory at a time.
+    """
+    chunk = []
+    for lineno, line in enumerate(in_stream, start=1):
+        if not line.strip():
+            continue
+        chunk.append((lineno, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(all_answers, in_stream, out_stream, workers=1, ordered=True,
+              chunk_size=32, seed=None, weights=None):
+    """
+    Stream records from `in_stream` through the solver and write one JSON
+    line per record to `out_stream`.
+
+    - workers=1 solves everything in this process.
+    - workers>1 uses a process pool; at most 2 * workers chunks are in
+      flight, so memory stays bounded no matter how long the input is.
+    - ordered=False writes results as soon as each chunk finishes.
+
+    Returns the number of records processed.
+    """
+    written = 0
+
+    def emit(results):
+        nonlocal written
+        for result in results:
+            out_stream.write(json.dumps(result) + "\n")
+        out_stream.flush()
+        written += len(results)
+
+    chunks = _read_batch_chunks(in_stream, chunk_size)
+
+    if workers <= 1:
+        _init_batch_worker(all_answers, seed, weights, FILTER_CACHE.budget)
+        for chunk in chunks:
+            emit(_solve_batch_chunk(chunk))
+        return written
+
+    from concurrent.futures import (
+        FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait,
+    )
+
+    max_pending = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_batch_worker,
+                             initargs=(all_answers, seed, weights,
+                                       FILTER_CACHE.budget)) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_solve_batch_chunk, chunk))
+                if len(pending) >= max_pending:
+                    emit(pending.popleft().result())
+            while pending:
+                emit(pending.popleft().result())
+        else:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_solve_batch_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        emit(future.result())
+            for future in as_completed(pending):
+                emit(future.result())
+
+    return written
+
+
+def batch_main(args, all_answers, weights=None):
+    """
+    Entry point for `python Nerdle_Solver.py batch ...`.
+    Progress and errors go to stderr so stdout stays pure JSON lines.
+    """
+    in_stream = sys.stdin if args.input == "-" else open(args.input, "r")
+    try:
+        count = run_batch(
+            all_answers,
+            in_stream,
+            sys.stdout,
+            workers=args.workers,
+            ordered=not args.unordered,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+            weights=weights,
+        )
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+
+    print(f"Processed {count} records.", file=sys.stderr)
+    return 0
+
+
+# ---------------------------------------------------------------------
+# Sharded simulation: TCP/JSON coordinator and workers
+# ---------------------------------------------------------------------
+#
+# The coordinator splits the answer list into shards (ranges of secret
+# positions) and serves them to workers over newline-delimited JSON on
+# one persistent TCP connection per worker. Every message gets a reply:
+#
+#   worker -> {"type": "hello", "worker": name, "job": key}
+#          <- {"type": "welcome", "seed": s, "heartbeat": seconds}
+#   worker -> {"type": "request"}
+#          <- {"type": "shard", "shard": id, "start": i, "end": j}
+#             | {"type": "wait", "retry": seconds} | {"type": "done"}
+#   worker -> {"type": "heartbeat", "shard": id}            <- {"type": "ok"}
+#   worker -> {"type": "result", "shard": id, "guesses": [...]}
+#          <- {"type": "ok"}
+#
+# A shard whose worker disconnects or misses heartbeats for longer than
+# the timeout goes back in the queue. Each game is seeded from its secret's
+# position, so whichever worker finishes a shard first, the merged results
+# are identical to `simulate --all --seed` on one machine.
+
+def job_key(all_answers, weights=None):
+    """
+    Fingerprint of the exact answer list and prior a simulation runs on.
+    Without a prior this is the list's manifest hash (answer_list_key).
+    Workers must present the same key, or their results would not merge,
+    and FILTER_CACHE entries are keyed under it.
+    """
+    key = answer_list_key(all_answers)
+    if weights is None:
+        return key
+    h = hashlib.sha256(key.encode())
+    h.update(json.dumps([weights[eq] for eq in all_answers]).encode())
+    return h.hexdigest()
+
+
+def _send_message(wfile, message):
+    wfile.write((json.dumps(message) + "\n").encode())
+    wfile.flush()
+
+
+def _read_message(rfile):
+    line = rfile.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    msg = json.loads(line)
+    if not isinstance(msg, dict):
+        raise ValueError(f"expected a JSON object, got {type(msg).__name__}")
+    return msg
+
+
+class ShardCoordinator:
+    """
+    Book-keeping for a sharded simulation: which shards are queued, which
+    are out with a worker (and until when), and which are finished.
+    All methods are thread-safe; the TCP handler calls them per message.
+    """
+
+    def __init__(self, num_secrets, shard_size=200, heartbeat_timeout=30.0):
+        import threading
+
+        if shard_size <= 0:
+            raise ValueError("shard_size must be positive")
+        if heartbeat_timeout <= 0:
+            raise ValueError("heartbeat_timeout must be positive")
+
+        self.shards = [(start, min(start + shard_size, num_secrets))
+                       for start in range(0, num_secrets, shard_size)]
+        self.heartbeat_timeout = heartbeat_timeout
+        self.pending = deque(range(len(self.shards)))
+        self.assigned = {}   # shard id -> (worker name, deadline)
+        self.issued = {}     # shard id -> every worker it was handed to
+        self.results = {}    # shard id -> list of guess counts
+        self.reassigned = 0
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.shards:
+            self.finished.set()
+
+    def _reclaim_expired(self, now):
+        for sid, (worker, deadline) in list(self.assigned.items()):
+            if deadline < now:
+                del self.assigned[sid]
+                self.pending.appendleft(sid)
+                self.reassigned += 1
+
+    def request(self, worker):
+        with self.lock:
+            now = time.monotonic()
+            self._reclaim_expired(now)
+
+            if self.pending:
+                sid = self.pending.popleft()
+                self.assigned[sid] = (worker, now + self.heartbeat_timeout)
+                self.issued.setdefault(sid, set()).add(worker)
+                start, end = self.shards[sid]
+                return {"type": "shard", "shard": sid, "start": start, "end": end}
+
+            if self.finished.is_set():
+                return {"type": "done"}
+
+            # Everything is handed out; check back in case a shard is lost.
+            return {"type": "wait", "retry": min(1.0, self.heartbeat_timeout / 4)}
+
+    def heartbeat(self, worker, sid):
+        with self.lock:
+            owner = self.assigned.get(sid)
+            if owner is not None and owner[0] == worker:
+                self.assigned[sid] = (worker, time.monotonic() + self.heartbeat_timeout)
+
+    def _check_shard_id(self, sid):
+        if type(sid) is not int or not 0 <= sid < len(self.shards):
+            raise ValueError(f"unknown shard {sid!r}")
+
+    def complete(self, worker, sid, guesses):
+        """
+        Record a finished shard. The first complete result wins; a late
+        duplicate from a worker whose shard was reassigned is dropped.
+
+        Raises ValueError for unknown shard ids, malformed results, or a
+        shard that was never handed to `worker`.
+        """
+        self._check_shard_id(sid)
+        start, end = self.shards[sid]
+        if not isinstance(guesses, list) or len(guesses) != end - start:
+            raise ValueError(f"shard {sid} expects a list of {end - start} results")
+        if any(g is not None and type(g) is not int for g in guesses):
+            raise ValueError(f"shard {sid} results must be integers or null")
+
+        with self.lock:
+            if worker not in self.issued.get(sid, ()):
+                raise ValueError(f"shard {sid} was not assigned to {worker}")
+            if sid in self.results:
+                return
+            self.results[sid] = guesses
+            self.assigned.pop(sid, None)
+            if sid in self.pending:
+                self.pending.remove(sid)
+            if len(self.results) == len(self.shards):
+                self.finished.set()
+
+    def worker_lost(self, worker):
+        with self.lock:
+            for sid, (owner, _) in list(self.assigned.items()):
+                if owner == worker:
+                    del self.assigned[sid]
+                    self.pending.appendleft(sid)
+                    self.reassigned += 1
+
+    def merged(self):
+        """Guess counts for every secret, in answer-list order."""
+        guess_counts = []
+        for sid in range(len(self.shards)):
+            guess_counts.extend(self.results[sid])
+        return guess_counts
+
+
+def _handle_worker_connection(server, rfile, wfile, client_address):
+    """Serve one worker connection, dispatching its messages to the coordinator."""
+    coordinator = server.coordinator
+    worker = f"{client_address[0]}:{client_address[1]}"
+
+    try:
+        hello = _read_message(rfile)
+        if hello.get("type") != "hello" or hello.get("job") != server.job_key:
+            _send_message(wfile, {"type": "error",
+                                  "error": "answer list / prior mismatch"})
+            return
+
+        # Key ownership on the connection, not just the self-reported
+        # name, so two workers sharing a name cannot claim or drop each
+        # other's shards.
+        name = hello.get("worker")
+        if name:
+            worker = f"{name}@{worker}"
+        _send_message(wfile, {
+            "type": "welcome",
+            "seed": server.seed,
+            "heartbeat": coordinator.heartbeat_timeout / 3,
+        })
+
+        while True:
+            msg = _read_message(rfile)
+            kind = msg.get("type")
+
+            if kind == "request":
+                reply = coordinator.request(worker)
+            elif kind == "heartbeat":
+                coordinator.heartbeat(worker, msg["shard"])
+                reply = {"type": "ok"}
+            elif kind == "result":
+                coordinator.complete(worker, msg["shard"], msg["guesses"])
+                reply = {"type": "ok"}
+            else:
+                reply = {"type": "error", "error": f"unknown message '{kind}'"}
+
+            _send_message(wfile, reply)
+            if reply["type"] == "done":
+                return
+
+    except (ConnectionError, OSError, ValueError, KeyError, IndexError, TypeError):
+        pass
+    finally:
+        coordinator.worker_lost(worker)
+
+
+def _make_shard_server(address):
+    """
+    Build the coordinator's threaded TCP server. socketserver is only
+    imported here, so the classes are defined on first use.
+    """
+    import socketserver
+
+    class ShardRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            _handle_worker_connection(self.server, self.rfile, self.wfile,
+                                      self.client_address)
+
+    class ShardServer(socketserver.ThreadingTCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    return ShardServer(address, ShardRequestHandler)
+
+
+def run_coordinator(all_answers, host="127.0.0.1", port=0, weights=None,
+                    seed=0, shard_size=200, heartbeat_timeout=30.0,
+                    local_workers=0, worker_args=()):
+    """
+    Serve a full simulation to workers and print the merged results.
+
+    - port=0 picks a free port; the chosen address is printed so remote
+      workers can be pointed at it.
+    - local_workers starts that many `work` subprocesses on this machine
+      (with `worker_args` passed through, e.g. --answers / --weights).
+
+    Returns the per-secret guess counts in answer-list order.
+    """
+    import subprocess
+    import threading
+
+    coordinator = ShardCoordinator(len(all_answers), shard_size, heartbeat_timeout)
+
+    server = _make_shard_server((host, port))
+    server.coordinator = coordinator
+    server.job_key = job_key(all_answers, weights)
+    server.seed = seed
+
+    bound_host, bound_port = server.server_address[:2]
+    print(f"\nCoordinator listening on {bound_host}:{bound_port} "
+          f"({len(coordinator.shards)} shards of up to {shard_size} secrets)")
+
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    procs = []
+    for _ in range(local_workers):
+        procs.append(subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "work",
+             "--host", bound_host, "--port", str(bound_port), *worker_args],
+        ))
+
+    start = time.perf_counter()
+    try:
+        reported = -1
+        while not coordinator.finished.wait(timeout=1.0):
+            done = len(coordinator.results)
+            if done != reported:
+                print(f"  Completed {done}/{len(coordinator.shards)} shards...")
+                reported = done
+    finally:
+        # Workers polling with "wait" retry within a second; let them hear
+        # "done" and exit cleanly before the server goes away.
+        if coordinator.finished.is_set():
+            time.sleep(1.5)
+        for proc in procs:
+            try:
+                proc.wait(timeout=5 * heartbeat_timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        server.shutdown()
+        server.server_close()
+
+    elapsed = time.perf_counter() - start
+    guess_counts = coordinator.merged()
+
+    print(f"  Completed {len(coordinator.shards)}/{len(coordinator.shards)} shards "
+          f"in {elapsed:.1f} s ({coordinator.reassigned} reassigned)")
+
+    for secret, guesses in zip(all_answers, guess_counts):
+        if guesses is None:
+            print(f"Simulation failed for secret {secret}.")
+
+    print_full_results(all_answers, guess_counts, weights)
+    return guess_counts
+
+
+def run_worker(all_answers, host, port, weights=None, connect_timeout=30.0,
+               name=None):
+    """
+    Connect to a coordinator and simulate shards until it says "done".
+    Connection attempts are retried for `connect_timeout` seconds so
+    workers can be started before the coordinator.
+
+    Returns the number of shards this worker completed.
+    """
+    import socket
+
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    answer_index = build_answer_index(all_answers, weights)
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=None)
+            break
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+    completed = 0
+    with sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+        _send_message(wfile, {"type": "hello", "worker": name,
+                              "job": job_key(all_answers, weights)})
+        welcome = _read_message(rfile)
+        if welcome.get("type") != "welcome":
+            raise ConnectionError(welcome.get("error", "rejected by coordinator"))
+
+        seed = welcome["seed"]
+        heartbeat_every = welcome["heartbeat"]
+
+        while True:
+            _send_message(wfile, {"type": "request"})
+            msg = _read_message(rfile)
+
+            if msg["type"] == "done":
+                return completed
+            if msg["type"] == "wait":
+                time.sleep(msg["retry"])
+                continue
+            if msg["type"] != "shard":
+                raise ConnectionError(msg.get("error", f"unexpected message {msg}"))
+
+            guesses = []
+            last_beat = time.monotonic()
+            for i in range(msg["start"], msg["end"]):
+                random.seed(f"{seed}:{i}")
+                guesses.append(simulate_single_game(all_answers[i], answer_index,
+                                                    weights=weights))
+
+                if time.monotonic() - last_beat >= heartbeat_every:
+                    _send_message(wfile, {"type": "heartbeat", "shard": msg["shard"]})
+                    _read_message(rfile)
+                    last_beat = time.monotonic()
+
+            _send_message(wfile, {"type": "result", "shard": msg["shard"],
+                                  "guesses": guesses})
+            _read_message(rfile)
+            completed += 1
+
+
+# ---------------------------------------------------------------------
+# Startup timing and benchmark mode
+# ---------------------------------------------------------------------
+
+def measure_cold_start(runs=3):
+    """
+    Time `import Nerdle_Solver` in fresh interpreters.
+
+    Returns (best_seconds, tk_loaded), where tk_loaded says whether
+    tkinter ended up in sys.modules -- it never should on import.
+    """
+    import subprocess
+
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    module_name = os.path.splitext(os.path.basename(__file__))[0]
+    code = (
+        "import sys, time; t = time.perf_counter(); "
+        f"import {module_name}; "
+        "print(time.perf_counter() - t, 'tkinter' in sys.modules)"
+    )
+
+    best = float("inf")
+    tk_loaded = False
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=module_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        best = min(best, float(out[0]))
+        tk_loaded = tk_loaded or out[1] == "True"
+
+    return best, tk_loaded
+
+
+def print_startup_timing(load_seconds, num_answers, stream=sys.stderr):
+    print("Startup timing:", file=stream)
+    print(f"  Module import   : {1000 * MODULE_LOAD_SECONDS:.1f} ms", file=stream)
+    print(f"  Answer load     : {1000 * load_seconds:.1f} ms "
+          f"({num_answers} equations)", file=stream)
+
+
+def run_benchmark(all_answers, load_seconds, num_games=20, weights=None):
+    """
+    Report cold-start cost and solve throughput so regressions in either
+    show up as a number rather than a feeling.
+    """
+    print_startup_timing(load_seconds, len(all_answers), stream=sys.stdout)
+
+    cold_seconds, tk_loaded = measure_cold_start()
+    print(f"  Cold import     : {1000 * cold_seconds:.1f} ms (best of 3, fresh interpreter)")
+    print(f"  tkinter loaded  : {'yes (regression!)' if tk_loaded else 'no'}")
+
+    if num_games <= 0:
         return
 
-    run_gui_solver(all_answers)
+    secrets = random.sample(all_answers, min(num_games, len(all_answers)))
+
+    build_start = time.perf_counter()
+    answer_index = build_answer_index(all_answers, weights)
+    build_seconds = time.perf_counter() - build_start
+    results = []
+
+    start = time.perf_counter()
+    for secret in secrets:
+        guesses = simulate_single_game(secret, answer_index, weights=weights)
+        if guesses is not None:
+            results.append(guesses)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nSolve speed over {len(secrets)} games:")
+    print(f"  Index build     : {1000 * build_seconds:.1f} ms (incl. opening table)")
+    print(f"  Total time      : {elapsed:.2f} s")
+    print(f"  Per game        : {1000 * elapsed / len(secrets):.1f} ms")
+    if results:
+        print(f"  Average guesses : {sum(results) / len(results):.3f}")
+
+
+def coordinate_main(args, all_answers, weights=None):
+    worker_args = ["--answers", args.answers]
+    if args.weights:
+        worker_args += ["--weights", args.weights]
+    if args.length is not None:
+        worker_args += ["--length", str(args.length)]
+    if args.memory_budget is not None:
+        worker_args += ["--memory-budget", str(args.memory_budget)]
+
+    run_coordinator(
+        all_answers,
+        host=args.host,
+        port=args.port,
+        weights=weights,
+        seed=args.seed if args.seed is not None else 0,
+        shard_size=args.shard_size,
+        heartbeat_timeout=args.heartbeat_timeout,
+        local_workers=args.local_workers,
+        worker_args=worker_args,
+    )
+    return 0
+
+
+def work_main(args, all_answers, weights=None):
+    try:
+        completed = run_worker(all_answers, args.host, args.port, weights=weights,
+                               connect_timeout=args.connect_timeout)
+    except (ConnectionError, OSError) as exc:
+        print(f"Worker stopped: {exc}", file=sys.stderr)
+        return 1
+    print(f"Worker finished {completed} shards.", file=sys.stderr)
+    return 0
+
+
+def validate_main(args):
+    """
+    Entry point for `python Nerdle_Solver.py validate ...`: (re)build the
+    manifest for an answer list and report what was rejected.
+    """
+    try:
+        with open(args.answers, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        print(f"Error: Could not find file '{args.answers}'.", file=sys.stderr)
+        return 1
+
+    entries = [(n, line.split()[0])
+               for n, line in enumerate(data.decode().splitlines(), start=1)
+               if line.strip()]
+    length = args.length
+    if length is None:
+        length = list_length(args.answers, entries)
+
+    start = time.perf_counter()
+    manifest = load_or_build_manifest(args.answers, entries,
+                                      length=length, workers=args.workers,
+                                      force=args.force)
+    elapsed = time.perf_counter() - start
+
+    print(f"Answer list : {args.answers}")
+    print(f"SHA-256     : {manifest['sha256']}")
+    print(f"Valid       : {manifest['count']} equations in {len(manifest['forms'])} forms")
+    print(f"Rejected    : {len(manifest['rejected'])}")
+    print(f"Time        : {1000 * elapsed:.1f} ms")
+
+    for r in manifest["rejected"]:
+        print(f"  line {r['line']}: {r['equation']} -- {r['reason']}")
+
+    return 1 if manifest["rejected"] else 0
+
+
+def run_memory_report(all_answers, weights=None, num_games=200, top=5):
+    """
+    Print the memory report before and after a simulation run, with
+    tracemalloc's current / peak traced memory and the allocation sites
+    that grew the most during the run.
+    """
+    import tracemalloc
+
+    print_memory_report(memory_report(all_answers, weights))
+
+    if num_games <= 0:
+        return
+
+    tracemalloc.start()
+    set_peak_tracking(True)
+    before = tracemalloc.take_snapshot()
+
+    try:
+        simulate_many_games(all_answers, num_games=num_games, weights=weights)
+    finally:
+        set_peak_tracking(False)
+
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    print()
+    print_memory_report(memory_report(all_answers, weights))
+
+    print(f"\nTraced during {num_games} games:")
+    print(f"  Current         : {_format_bytes(current)}")
+    print(f"  Peak            : {_format_bytes(peak)}")
+    print(f"  Top {top} allocation sites by growth:")
+    for stat in after.compare_to(before, "lineno")[:top]:
+        frame = stat.traceback[0]
+        print(f"    {os.path.basename(frame.filename)}:{frame.lineno}: "
+              f"{_format_bytes(stat.size_diff)} ({stat.count_diff:+d} blocks)")
+
+
+def _positive(kind):
+    """argparse type: `kind` (int or float) that must be greater than zero."""
+    def convert(text):
+        import argparse
+
+        value = kind(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+        return value
+
+    convert.__name__ = kind.__name__
+    return convert
+
+
+def _non_negative_int(text):
+    """argparse type: int that must be 0 or more."""
+    import argparse
+
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {text}")
+    return value
+
+
+def build_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Nerdle solver. With no command, launches the GUI."
+    )
+
+    # Options shared by every command.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--answers", default="NerdleClassicRestricted.txt",
+                        help="equation list to load")
+    common.add_argument("--weights", default=None,
+                        help="sidecar file of 'equation weight' lines giving a prior")
+    common.add_argument("--seed", type=int, default=None,
+                        help="seed for reproducible tie-breaking")
+    common.add_argument("--length", type=int, default=None,
+                        help="equation length of the list (default: from its manifest, "
+                             "else the first equation)")
+    common.add_argument("--timing", action="store_true",
+                        help="report startup timing on stderr")
+    common.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="per-process cache budget in MiB (default 64, 0 disables caching)")
+
+    sub = parser.add_subparsers(dest="command")
+
+    sub.add_parser("gui", parents=[common],
+                   help="launch the Tk GUI solver (default)")
+
+    sub.add_parser("solve", parents=[common],
+                   help="interactive solve in the terminal, entering G/P/B feedback")
+
+    simulate = sub.add_parser("simulate", parents=[common],
+                              help="run the solver against known secrets")
+    simulate.add_argument("-n", "--games", type=int, default=100,
+                          help="number of random games (default 100)")
+    simulate.add_argument("--all", action="store_true",
+                          help="simulate every answer instead of a random sample")
+    simulate.add_argument("--menu", action="store_true",
+                          help="open the interactive simulation menu")
+
+    memory = sub.add_parser("memory", parents=[common],
+                            help="report memory used by answers, candidate sets and caches")
+    memory.add_argument("-n", "--games", type=int, default=200,
+                        help="random games to simulate under tracemalloc (default 200, 0 to skip)")
+
+    benchmark = sub.add_parser("benchmark", parents=[common],
+                               help="measure startup time and solve speed")
+    benchmark.add_argument("-n", "--games", type=int, default=20,
+                           help="number of games to time (default 20, 0 to skip)")
+
+    validate = sub.add_parser("validate", parents=[common],
+                              help="check every equation and write the integrity manifest")
+    validate.add_argument("-j", "--workers", type=_positive(int), default=None,
+                          help="worker processes (default: all cores for large lists)")
+    validate.add_argument("--force", action="store_true",
+                          help="revalidate even if the manifest hash matches")
+
+    coordinate = sub.add_parser(
+        "coordinate", parents=[common],
+        help="run a full simulation by handing out shards to workers over TCP",
+    )
+    coordinate.add_argument("--host", default="127.0.0.1",
+                            help="address to listen on (0.0.0.0 for remote workers)")
+    coordinate.add_argument("--port", type=int, default=0,
+                            help="port to listen on (default: any free port)")
+    coordinate.add_argument("--shard-size", type=_positive(int), default=200,
+                            help="secrets per shard (default 200)")
+    coordinate.add_argument("--heartbeat-timeout", type=_positive(float), default=30.0,
+                            help="seconds without a heartbeat before a shard is reassigned")
+    coordinate.add_argument("-j", "--local-workers", type=_non_negative_int, default=0,
+                            help="worker processes to start on this machine")
+
+    work = sub.add_parser("work", parents=[common],
+                          help="simulate shards served by a coordinator")
+    work.add_argument("--host", default="127.0.0.1", help="coordinator address")
+    work.add_argument("--port", type=int, required=True, help="coordinator port")
+    work.add_argument("--connect-timeout", type=float, default=30.0,
+                      help="seconds to keep retrying the initial connection")
+
+    batch = sub.add_parser(
+        "batch", parents=[common],
+        help="solve secrets or replay transcripts from stdin/file as JSON lines",
+    )
+    batch.add_argument("input", nargs="?", default="-",
+                       help="input file, or '-' for stdin (default)")
+    batch.add_argument("-j", "--workers", type=_positive(int), default=1,
+                       help="number of worker processes (default 1)")
+    batch.add_argument("--unordered", action="store_true",
+                       help="write results as they finish instead of in input order")
+    batch.add_argument("--chunk-size", type=_positive(int), default=32,
+                       help="records per task sent to a worker (default 32)")
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(["gui"])
+
+    if args.command == "validate":
+        return validate_main(args)
+
+    load_start = time.perf_counter()
+    all_answers, weights = startup(args.answers, args.weights, with_weights=True,
+                                   length=args.length)
+    load_seconds = time.perf_counter() - load_start
+
+    if args.timing:
+        print_startup_timing(load_seconds, len(all_answers))
+
+    if args.memory_budget is not None:
+        set_memory_budget(int(args.memory_budget * 1024 * 1024))
+
+    if not all_answers:
+        print("Startup failed — no answers loaded.", file=sys.stderr)
+        return 1
+
+    # Batch and sharded modes seed per game inside the workers instead.
+    if args.seed is not None and args.command not in ("batch", "coordinate", "work"):
+        random.seed(args.seed)
+
+    if args.command == "batch":
+        return batch_main(args, all_answers, weights)
+    if args.command == "coordinate":
+        return coordinate_main(args, all_answers, weights)
+    if args.command == "work":
+        return work_main(args, all_answers, weights)
+
+    if args.command == "solve":
+        solve_puzzle(all_answers, weights)
+    elif args.command == "simulate":
+        if args.menu:
+            cli_simulation_menu(all_answers, weights)
+        elif args.all:
+            simulate_all_answers(all_answers, weights, seed=args.seed)
+        else:
+            simulate_many_games(all_answers, num_games=args.games, weights=weights)
+    elif args.command == "memory":
+        run_memory_report(all_answers, weights, num_games=args.games)
+    elif args.command == "benchmark":
+        run_benchmark(all_answers, load_seconds, num_games=args.games,
+                      weights=weights)
+    else:
+        return run_gui_solver(all_answers, weights)
+
+    return 0
+
+
+MODULE_LOAD_SECONDS = time.perf_counter() - _MODULE_LOAD_START
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
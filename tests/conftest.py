@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import Nerdle_Solver as ns  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def all_answers():
+    return ns.startup(os.path.join(REPO_ROOT, "NerdleClassicRestricted.txt"),
+                      validate=False)
+
+
+@pytest.fixture
+def answers_file(tmp_path, all_answers):
+    """A small answer list on disk (includes START_GUESS)."""
+    answers = sorted(set(all_answers[:300]) | {ns.START_GUESS})
+    path = tmp_path / "answers.txt"
+    path.write_text("\n".join(answers) + "\n")
+    return str(path), answers
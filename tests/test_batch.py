@@ -0,0 +1,86 @@
+import io
+import json
+
+import pytest
+
+import Nerdle_Solver as ns
+
+
+@pytest.fixture
+def batch_worker(all_answers):
+    ns._init_batch_worker(all_answers, seed=1)
+
+
+def test_parse_plain_secret_and_transcript():
+    assert ns.parse_batch_record("3*4+5=17\n") == {"secret": "3*4+5=17"}
+    assert ns.parse_batch_record("3*4+5=17:bbpbbgbb") == {
+        "turns": [("3*4+5=17", "BBPBBGBB")]
+    }
+
+
+def test_parse_json_record_keeps_id():
+    record = ns.parse_batch_record('{"id": 7, "turns": [["3*4+5=17", "GGGGGGGG"]]}')
+    assert record == {"id": 7, "turns": [("3*4+5=17", "GGGGGGGG")]}
+
+
+@pytest.mark.parametrize("line", ["{not json", '{"foo": 1}', "3*4+5=17 nocolon"])
+def test_parse_rejects_malformed(line):
+    with pytest.raises(ValueError):
+        ns.parse_batch_record(line)
+
+
+@pytest.mark.parametrize("line", ["12:GB", "12:GG", "3*4+5=1a:GGGGGGGG",
+                                  "3*4+5=17:GGG", "bogus"])
+def test_bad_records_become_errors(batch_worker, line):
+    result = ns.solve_batch_record(1, line)
+    assert "error" in result
+    assert "solved" not in result
+
+
+@pytest.mark.parametrize("line, error", [
+    ("99999999:GGGGGGGG", "inconsistent"),
+    ("3*4+5=17:BBBBBBBB 10-2*4=2:GGGGGGGG", "inconsistent"),
+    ("3*4+5=17:GGGGGGGG 1+2+3=99:GGGGGGGG", "after the solve on turn 1"),
+])
+def test_inconsistent_transcripts_are_rejected(batch_worker, line, error):
+    result = ns.solve_batch_record(1, line)
+    assert error in result["error"]
+    assert "solved" not in result
+
+
+def test_transcript_reports_solving_turn(batch_worker):
+    feedback = ns.compute_feedback("10-2*4=2", "3*4+5=17")
+    result = ns.solve_batch_record(1, f"3*4+5=17:{feedback} 10-2*4=2:GGGGGGGG")
+    assert result == {"line": 1, "turns": 2, "solved": True,
+                      "candidates_left": 1, "answer": "10-2*4=2"}
+
+
+def test_secret_record_reports_path(batch_worker):
+    result = ns.solve_batch_record(3, "3*4+5=17")
+    assert result == {"line": 3, "secret": "3*4+5=17", "guesses": 1,
+                      "path": ["3*4+5=17"]}
+
+
+def test_bad_line_does_not_stop_stream(all_answers):
+    lines = "12:GB\n\n3*4+5=17\n"
+    out = io.StringIO()
+    count = ns.run_batch(all_answers, io.StringIO(lines), out, seed=1)
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert count == 2
+    assert [r["line"] for r in results] == [1, 3]
+    assert "error" in results[0]
+    assert results[1]["guesses"] == 1
+
+
+def test_parallel_output_matches_serial(answers_file):
+    _, answers = answers_file
+    lines = "".join(eq + "\n" for eq in answers[:40])
+
+    serial = io.StringIO()
+    ns.run_batch(answers, io.StringIO(lines), serial, seed=5)
+    parallel = io.StringIO()
+    ns.run_batch(answers, io.StringIO(lines), parallel, workers=2,
+                 chunk_size=4, seed=5)
+
+    assert parallel.getvalue() == serial.getvalue()
@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+
+import pytest
+
+import Nerdle_Solver as ns
+
+
+def random_filters(answers, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        secret = rng.choice(answers)
+        guess = rng.choice(answers)
+        yield guess, ns.compute_feedback(secret, guess)
+
+
+@pytest.fixture(scope="module")
+def weights(all_answers):
+    rng = random.Random(3)
+    return {eq: rng.random() for eq in all_answers}
+
+
+@pytest.fixture(scope="module")
+def index(all_answers, weights):
+    return ns.CandidateIndex.from_answers(all_answers, weights)
+
+
+def assert_stats_consistent(index, weights):
+    assert len(index) == sum(len(eqs) for eqs in index.buckets.values())
+    for fk, eqs in index.buckets.items():
+        assert all(ns.form_key(eq) == fk for eq in eqs)
+        assert index.symbol_counts[fk] == Counter("".join(eqs))
+        assert index.form_weights[fk] == pytest.approx(sum(weights[eq] for eq in eqs))
+
+
+def test_filter_matches_filter_candidates(all_answers, index, weights):
+    for guess, fb in random_filters(all_answers, 40, seed=1):
+        expected = ns.filter_candidates(all_answers, guess, fb)
+        result = index.filter(guess, fb)
+        assert sorted(result) == sorted(expected)
+        assert_stats_consistent(result, weights)
+
+        # One level deeper, filtering the already-filtered index.
+        if expected:
+            guess2 = expected[0]
+            fb2 = ns.compute_feedback(expected[-1], guess2)
+            assert sorted(result.filter(guess2, fb2)) == sorted(
+                ns.filter_candidates(expected, guess2, fb2))
+
+
+def test_filter_candidates_accepts_index(all_answers, index):
+    guess = ns.START_GUESS
+    fb = ns.compute_feedback("10-2*4=2", guess)
+    result = ns.filter_candidates(index, guess, fb)
+    assert isinstance(result, ns.CandidateIndex)
+    assert "10-2*4=2" in result
+
+
+def test_form_matches_feedback_never_drops_a_match(all_answers):
+    for guess, fb in random_filters(all_answers, 100, seed=2):
+        for eq in ns.filter_candidates(all_answers[::7], guess, fb):
+            assert ns.form_matches_feedback(ns.form_key(eq), guess, fb)
+
+
+def test_form_matches_feedback_prunes_operator_layout():
+    guess = "3*4+5=17"
+    fb = ns.compute_feedback("12+34=46", guess)
+    assert ns.form_matches_feedback("DD+DD=DD", guess, fb)
+    assert not ns.form_matches_feedback("D*D+D=DD", guess, fb)
+
+
+def test_partition_matches_filter(all_answers, index, weights):
+    parts = index.partition(ns.START_GUESS)
+    assert sum(len(p) for p in parts.values()) == len(all_answers)
+
+    for fb, part in list(parts.items())[:60]:
+        filtered = index.filter(ns.START_GUESS, fb)
+        assert list(part) == list(filtered)
+        assert part.symbol_counts == filtered.symbol_counts
+        assert part.form_weights == filtered.form_weights
+
+
+def test_cached_filtering_gives_same_results(all_answers):
+    keyed = ns.build_answer_index(all_answers)
+    plain = ns.CandidateIndex.from_answers(all_answers)
+    for guess, fb in random_filters(all_answers, 30, seed=4):
+        assert list(keyed.filter(guess, fb)) == list(plain.filter(guess, fb))
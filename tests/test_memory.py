@@ -0,0 +1,162 @@
+import gc
+
+import pytest
+
+import Nerdle_Solver as ns
+
+
+class Sized:
+    """Stand-in cache entry with a fixed nbytes()."""
+
+    def __init__(self, nbytes):
+        self.size = nbytes
+
+    def nbytes(self):
+        return self.size
+
+
+@pytest.fixture
+def filter_cache():
+    """Give the test an empty global cache and restore its budget after."""
+    budget = ns.FILTER_CACHE.budget
+    ns.FILTER_CACHE.clear()
+    ns.FILTER_CACHE.hits = ns.FILTER_CACHE.misses = ns.FILTER_CACHE.evictions = 0
+    yield ns.FILTER_CACHE
+    ns.FILTER_CACHE.set_budget(budget)
+    ns.FILTER_CACHE.clear()
+
+
+def test_lru_eviction_within_budget():
+    cache = ns.FilterCache(budget=300)
+    for key in "abc":
+        assert cache.put(key, Sized(100))
+    assert cache.get("a") is not None  # a is now most recently used
+
+    assert cache.put("d", Sized(100))
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.get("b") is None
+    assert cache.stats() == {"bytes": 300, "budget": 300, "entries": 3,
+                             "hits": 1, "misses": 1, "evictions": 1}
+
+
+def test_entry_larger_than_budget_is_not_stored():
+    cache = ns.FilterCache(budget=300)
+    cache.put("a", Sized(100))
+    assert not cache.put("big", Sized(301))
+    assert list(cache.entries) == ["a"]
+    assert cache.evictions == 0
+
+
+def test_put_without_eviction_only_fills_free_space():
+    cache = ns.FilterCache(budget=300)
+    assert cache.put("a", Sized(200), evict=False)
+    assert not cache.put("b", Sized(150), evict=False)
+    assert cache.put("c", Sized(100), evict=False)
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.nbytes == 300
+    assert cache.evictions == 0
+
+
+def test_shrinking_budget_evicts_and_zero_disables():
+    cache = ns.FilterCache(budget=None)
+    for key in "abc":
+        cache.put(key, Sized(100))
+
+    cache.set_budget(150)
+    assert list(cache.entries) == ["c"]
+    assert cache.evictions == 2
+
+    cache.set_budget(0)
+    assert cache.nbytes == 0
+    assert not cache.put("d", Sized(1))
+
+
+def test_filter_hits_and_misses(filter_cache, all_answers):
+    index = ns.build_answer_index(all_answers, precompute=False)
+    guess = ns.START_GUESS
+    fb = ns.compute_feedback("10-2*4=2", guess)
+
+    first = index.filter(guess, fb)
+    assert index.filter(guess, fb) is first
+    assert (filter_cache.misses, filter_cache.hits) == (1, 1)
+    assert filter_cache.nbytes == first.nbytes()
+
+    # Large results are keyed themselves, so their filters are cached too.
+    assert len(first) >= ns.FILTER_CACHE_MIN_SIZE
+    assert first.cache_key == (index.cache_key, guess, fb)
+
+
+def test_small_results_are_cached_but_not_keyed(filter_cache, all_answers):
+    index = ns.build_answer_index(all_answers, precompute=False)
+    guess = ns.START_GUESS
+    fb = ns.compute_feedback(guess, guess)
+
+    solved = index.filter(guess, fb)
+    assert len(solved) < ns.FILTER_CACHE_MIN_SIZE
+    assert solved.cache_key is None
+    assert (index.cache_key, guess, fb) in filter_cache.entries
+
+    solved.filter(guess, fb)
+    assert len(filter_cache.entries) == 1
+
+
+def test_zero_budget_disables_caching(filter_cache, all_answers):
+    ns.set_memory_budget(0)
+    index = ns.build_answer_index(all_answers)
+    guess = ns.START_GUESS
+    fb = ns.compute_feedback("10-2*4=2", guess)
+
+    assert sorted(index.filter(guess, fb)) == sorted(
+        ns.filter_candidates(all_answers, guess, fb))
+    assert filter_cache.stats()["entries"] == 0
+    assert filter_cache.nbytes == 0
+
+
+def test_precompute_partition_respects_budget(filter_cache, all_answers):
+    index = ns.build_answer_index(all_answers, precompute=False)
+    cached, total = ns.precompute_partition(index, ns.START_GUESS)
+    assert cached == total == len(index.partition(ns.START_GUESS))
+    full = filter_cache.nbytes
+
+    filter_cache.clear()
+    filter_cache.set_budget(full // 4)
+    cached, total = ns.precompute_partition(index, ns.START_GUESS)
+    assert 0 < cached < total
+    assert filter_cache.nbytes <= full // 4
+    assert filter_cache.evictions == 0
+
+
+def test_memory_report_live_and_peak(filter_cache, all_answers):
+    ns._PEAK_CANDIDATE_BYTES.clear()
+    index = ns.build_answer_index(all_answers, precompute=False)
+
+    report = ns.memory_report(all_answers)
+    assert report["answers"] > 0
+    assert report["weights"] == 0
+    assert report["candidates"]["answer_index"] == {"live": index.nbytes(),
+                                                    "peak": None}
+    assert report["filter_cache"] == filter_cache.stats()
+
+    ns.set_peak_tracking(True)
+    try:
+        ns.simulate_single_game("10-2*4=2", index)
+    finally:
+        ns.set_peak_tracking(False)
+    peak = ns.memory_report()["candidates"]["simulate_single_game"]["peak"]
+    assert peak >= index.filter(
+        ns.START_GUESS, ns.compute_feedback("10-2*4=2", ns.START_GUESS)).nbytes()
+
+    # Untracked games leave the recorded peak alone.
+    ns.simulate_single_game("3*4+5=17", index)
+    assert ns.memory_report()["candidates"]["simulate_single_game"]["peak"] == peak
+
+
+def test_finished_candidate_sets_drop_out(all_answers):
+    owner = "test_memory"
+    index = ns.CandidateIndex.from_answers(all_answers[:50])
+    ns.track_candidates(owner, index)
+    assert ns.memory_report()["candidates"][owner]["live"] == index.nbytes()
+
+    del index
+    gc.collect()
+    assert owner not in ns.memory_report()["candidates"]
@@ -0,0 +1,209 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import Nerdle_Solver as ns
+
+
+def test_shards_cover_every_secret():
+    coordinator = ns.ShardCoordinator(10, shard_size=4)
+    assert coordinator.shards == [(0, 4), (4, 8), (8, 10)]
+    assert ns.ShardCoordinator(0).finished.is_set()
+
+
+@pytest.mark.parametrize("kwargs", [{"shard_size": 0}, {"shard_size": -2},
+                                    {"heartbeat_timeout": 0}])
+def test_non_positive_settings_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        ns.ShardCoordinator(10, **kwargs)
+
+
+@pytest.mark.parametrize("option", [["--shard-size", "0"], ["--shard-size", "-3"],
+                                    ["--heartbeat-timeout", "0"], ["-j", "-1"]])
+def test_coordinate_rejects_non_positive_options(option, capsys):
+    with pytest.raises(SystemExit) as exc:
+        ns.build_arg_parser().parse_args(["coordinate", *option])
+    assert exc.value.code == 2
+    assert "must be" in capsys.readouterr().err
+
+
+def test_lost_worker_shard_is_requeued():
+    coordinator = ns.ShardCoordinator(4, shard_size=2)
+    first = coordinator.request("a")
+    coordinator.request("b")
+    assert coordinator.request("c")["type"] == "wait"
+
+    coordinator.worker_lost("a")
+    assert coordinator.reassigned == 1
+    assert coordinator.request("c")["shard"] == first["shard"]
+
+
+def test_expired_heartbeat_is_requeued():
+    coordinator = ns.ShardCoordinator(2, shard_size=2, heartbeat_timeout=0.05)
+    sid = coordinator.request("a")["shard"]
+    time.sleep(0.1)
+    assert coordinator.request("b")["shard"] == sid
+    assert coordinator.reassigned == 1
+
+
+def test_heartbeat_extends_deadline():
+    coordinator = ns.ShardCoordinator(2, shard_size=2, heartbeat_timeout=0.2)
+    sid = coordinator.request("a")["shard"]
+    for _ in range(3):
+        time.sleep(0.1)
+        coordinator.heartbeat("a", sid)
+    assert coordinator.request("b")["type"] == "wait"
+
+
+def test_first_result_wins():
+    coordinator = ns.ShardCoordinator(2, shard_size=2, heartbeat_timeout=0.05)
+    sid = coordinator.request("slow")["shard"]
+    time.sleep(0.1)
+    assert coordinator.request("fast")["shard"] == sid
+
+    # The reassigned-away worker finishes first; its result is kept.
+    coordinator.complete("slow", sid, [3, 4])
+    coordinator.complete("fast", sid, [5, 6])
+    assert coordinator.finished.is_set()
+    assert coordinator.merged() == [3, 4]
+    assert coordinator.request("fast") == {"type": "done"}
+
+
+@pytest.mark.parametrize("sid", [99, -1, "0", True, None, 0.0])
+def test_unknown_shard_ids_are_rejected(sid):
+    coordinator = ns.ShardCoordinator(4, shard_size=2)
+    coordinator.request("a")
+    with pytest.raises(ValueError):
+        coordinator.complete("a", sid, [3, 4])
+    assert coordinator.results == {}
+
+
+@pytest.mark.parametrize("guesses", [[3], [3, 4, 5], "34", [3, "4"]])
+def test_malformed_results_are_rejected(guesses):
+    coordinator = ns.ShardCoordinator(2, shard_size=2)
+    sid = coordinator.request("a")["shard"]
+    with pytest.raises(ValueError):
+        coordinator.complete("a", sid, guesses)
+
+
+def test_results_only_from_assigned_workers():
+    coordinator = ns.ShardCoordinator(4, shard_size=2)
+    sid = coordinator.request("a")["shard"]
+    with pytest.raises(ValueError):
+        coordinator.complete("b", sid, [3, 4])
+    with pytest.raises(ValueError):
+        coordinator.complete("a", sid + 1, [3, 4])
+    assert coordinator.results == {}
+
+
+@pytest.fixture
+def shard_server():
+    coordinator = ns.ShardCoordinator(4, shard_size=2)
+    server = ns._make_shard_server(("127.0.0.1", 0))
+    server.coordinator = coordinator
+    server.job_key = "job"
+    server.seed = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def connect(server):
+    sock = socket.create_connection(server.server_address[:2], timeout=5)
+    return sock, sock.makefile("rb"), sock.makefile("wb")
+
+
+def send_raw(wfile, obj):
+    wfile.write(json.dumps(obj).encode() + b"\n")
+    wfile.flush()
+
+
+@pytest.mark.parametrize("bad", [
+    [1],
+    "result",
+    {"type": "result", "shard": 99, "guesses": []},
+    {"type": "result", "shard": "0", "guesses": [1, 2]},
+    {"type": "heartbeat"},
+])
+def test_bad_shard_message_drops_connection(shard_server, capfd, bad):
+    coordinator = shard_server.coordinator
+    sock, rfile, wfile = connect(shard_server)
+    with sock, rfile, wfile:
+        ns._send_message(wfile, {"type": "hello", "worker": "w", "job": "job"})
+        assert ns._read_message(rfile)["type"] == "welcome"
+        ns._send_message(wfile, {"type": "request"})
+        assert ns._read_message(rfile)["type"] == "shard"
+
+        send_raw(wfile, bad)
+        assert rfile.readline() == b""
+
+    # The connection's shard went back on the queue.
+    assert coordinator.results == {}
+    assert coordinator.reassigned == 1
+    assert len(coordinator.pending) == 2
+    assert "Traceback" not in capfd.readouterr().err
+
+
+def test_non_object_hello_drops_connection(shard_server, capfd):
+    sock, rfile, wfile = connect(shard_server)
+    with sock, rfile, wfile:
+        send_raw(wfile, [1])
+        assert rfile.readline() == b""
+    assert "Traceback" not in capfd.readouterr().err
+
+
+def test_workers_sharing_a_name_keep_their_own_shards(shard_server):
+    coordinator = shard_server.coordinator
+    first, second = connect(shard_server), connect(shard_server)
+    shards = []
+    for _, rfile, wfile in (first, second):
+        ns._send_message(wfile, {"type": "hello", "worker": "w", "job": "job"})
+        assert ns._read_message(rfile)["type"] == "welcome"
+        ns._send_message(wfile, {"type": "request"})
+        shards.append(ns._read_message(rfile)["shard"])
+
+    # Closing the first connection requeues only its own shard ...
+    for f in reversed(first):
+        f.close()
+    deadline = time.monotonic() + 5
+    while not coordinator.reassigned and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(coordinator.pending) == [shards[0]]
+    assert shards[1] in coordinator.assigned
+
+    # ... and the second cannot report it as if it were the owner.
+    sock, rfile, wfile = second
+    with sock, rfile, wfile:
+        ns._send_message(wfile, {"type": "result", "shard": shards[0],
+                                 "guesses": [1, 2]})
+        assert rfile.readline() == b""
+    assert coordinator.results == {}
+
+
+def test_coordinator_matches_seeded_simulation(answers_file, monkeypatch):
+    path, answers = answers_file
+    answers = ns.startup(path)
+    seed = 7
+
+    reported = []
+    real_print_full_results = ns.print_full_results
+
+    def record(all_answers, guess_counts, weights=None):
+        reported.append(list(guess_counts))
+        real_print_full_results(all_answers, guess_counts, weights)
+
+    monkeypatch.setattr(ns, "print_full_results", record)
+
+    merged = ns.run_coordinator(answers, seed=seed, shard_size=64,
+                                heartbeat_timeout=10.0, local_workers=2,
+                                worker_args=["--answers", path])
+    ns.simulate_all_answers(answers, seed=seed)
+
+    assert len(merged) == len(answers)
+    assert None not in merged
+    assert reported == [merged, merged]
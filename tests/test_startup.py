@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = ["tkinter", "argparse", "socketserver", "subprocess",
+                "tracemalloc", "concurrent.futures.process"]
+
+
+def run_python(code, tmp_path, block_tk=False):
+    """Run `code` in a fresh interpreter with no display, from tmp_path."""
+    if block_tk:
+        code = "import sys; sys.modules['tkinter'] = None\n" + code
+    env = {k: v for k, v in os.environ.items() if k != "DISPLAY"}
+    env["PYTHONPATH"] = REPO_ROOT
+    return subprocess.run([sys.executable, "-c", code], capture_output=True,
+                          text=True, cwd=tmp_path, env=env, timeout=120)
+
+
+def test_import_leaves_heavy_modules_unloaded(tmp_path):
+    proc = run_python(
+        "import sys, json, Nerdle_Solver\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))",
+        tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout) == []
+
+
+def test_simulate_runs_headless(answers_file, tmp_path):
+    path, _ = answers_file
+    proc = run_python(
+        "import sys, Nerdle_Solver\n"
+        f"code = Nerdle_Solver.main(['simulate', '-n', '1', '--seed', '1', "
+        f"'--answers', {path!r}])\n"
+        "assert 'tkinter' not in sys.modules\n"
+        "sys.exit(code)",
+        tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    assert "Average guesses" in proc.stdout
+
+
+@pytest.mark.parametrize("block_tk", [True, False])
+def test_gui_without_tk_or_display_fails(answers_file, tmp_path, block_tk):
+    path, _ = answers_file
+    if not block_tk:
+        try:
+            import tkinter  # noqa: F401
+        except ImportError:
+            pytest.skip("tkinter is not installed")
+        if os.environ.get("DISPLAY"):
+            pytest.skip("a display is available")
+
+    proc = run_python(
+        "import sys, Nerdle_Solver\n"
+        f"sys.exit(Nerdle_Solver.main(['gui', '--answers', {path!r}]))",
+        tmp_path, block_tk=block_tk)
+    assert proc.returncode == 1
+    assert proc.stdout == ""
+    assert "'solve', 'simulate' or 'batch'" in proc.stderr
+    assert "Traceback" not in proc.stderr
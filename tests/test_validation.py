@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import Nerdle_Solver as ns
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("eq", [
+    "3*4+5=17",
+    "12/8*2=3",   # 12/8 is not whole, but 12/8*2 is
+    "8/3*3=8",    # shorter variants, checked at their own length
+    "0+12=12",
+    "10-2*4=2",
+])
+def test_check_equation_accepts(eq):
+    assert ns.check_equation(eq, length=len(eq)) is None
+
+
+@pytest.mark.parametrize("eq, reason", [
+    ("03+04=07", "leading zero"),
+    ("12/7*2=3", "inexact division"),
+    ("10-2*4=3", "left side is 2"),
+    ("1+2=0003", "leading zero"),
+    ("1=1=1=11", "exactly one '='"),
+    ("-1+22=21", "malformed left side"),
+    ("9/0+1=10", "division by zero"),
+    ("1+1=2", "length 5"),
+])
+def test_check_equation_rejects(eq, reason):
+    assert reason in ns.check_equation(eq)
+
+
+def test_validate_equations_reports_duplicates():
+    entries = [(1, "3*4+5=17"), (2, "10-2*4=3"), (4, "3*4+5=17")]
+    assert ns.validate_equations(entries) == [
+        {"line": 2, "equation": "10-2*4=3", "reason": "left side is 2, right side is 3"},
+        {"line": 4, "equation": "3*4+5=17", "reason": "duplicate of line 1"},
+    ]
+
+
+def test_parallel_validation_matches_serial(all_answers):
+    entries = list(enumerate(all_answers[:2000] + ["03+04=07", "3*4+5=17"], start=1))
+    assert (ns.validate_equations(entries, workers=2, chunk_size=500)
+            == ns.validate_equations(entries))
+
+
+def test_manifest_is_reused_until_the_file_changes(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "answers.txt"
+    path.write_text("3*4+5=17\n03+04=07\n10-2*4=2\n")
+
+    assert ns.startup(str(path)) == ["3*4+5=17", "10-2*4=2"]
+    assert "skipping 1 invalid" in capsys.readouterr().err
+    manifest = ns.read_manifest(str(path))
+    assert manifest["sha256"] == ns.job_key(["3*4+5=17", "10-2*4=2"])
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+    def fail(*args, **kwargs):
+        raise AssertionError("manifest should have been reused")
+
+    monkeypatch.setattr(ns, "validate_equations", fail)
+    assert ns.startup(str(path)) == ["3*4+5=17", "10-2*4=2"]
+
+    monkeypatch.undo()
+    path.write_text("3*4+5=17\n03+04=07\n10-2*4=3\n")
+    assert ns.startup(str(path)) == ["3*4+5=17"]
+    assert ns.read_manifest(str(path))["count"] == 1
+
+
+def test_job_key_matches_index_cache_key(all_answers):
+    assert ns.build_answer_index(all_answers, precompute=False).cache_key == ns.job_key(all_answers)
+
+
+def test_batch_stdout_stays_json_with_bad_answer_file(answers_file, tmp_path):
+    path, answers = answers_file
+    with open(path, "a") as f:
+        f.write("03+04=07\n")
+
+    proc = subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, "Nerdle_Solver.py"), "batch",
+         "--answers", path, "--seed", "1"],
+        input=f"{answers[0]}\n12:GG\n", capture_output=True, text=True,
+        cwd=tmp_path, timeout=120)
+
+    assert proc.returncode == 0
+    assert "skipping 1 invalid" in proc.stderr
+    records = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert len(records) == 2
+    assert "error" in records[1]
+
+
+def test_variant_length_list_survives_reload(tmp_path, capsys):
+    path = tmp_path / "mini.txt"
+    path.write_text("1+2=3\n2+2=4\n9-8=1\n")
+
+    assert ns.main(["validate", "--answers", str(path), "--length", "5"]) == 0
+    assert ns.read_manifest(str(path))["length"] == 5
+    assert ns.startup(str(path)) == ["1+2=3", "2+2=4", "9-8=1"]
+    assert ns.read_manifest(str(path))["rejected"] == []
+
+    # Without a manifest, the length comes from the first equation.
+    os.remove(ns.manifest_path(str(path)))
+    assert ns.startup(str(path)) == ["1+2=3", "2+2=4", "9-8=1"]
+    assert ns.startup(str(path), length=8) == []
+    assert "skipping 3 invalid" in capsys.readouterr().err
+
+
+def test_validate_missing_file_reports_on_stderr(tmp_path, capsys):
+    assert ns.main(["validate", "--answers", str(tmp_path / "missing.txt")]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Could not find file" in captured.err
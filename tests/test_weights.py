@@ -0,0 +1,60 @@
+import Nerdle_Solver as ns
+
+
+def test_weight_column_and_sidecar(tmp_path):
+    answers = tmp_path / "answers.txt"
+    answers.write_text("3*4+5=17 2.5\n10-2*4=2\n")
+    sidecar = tmp_path / "weights.txt"
+    sidecar.write_text("10-2*4=2 4\n")
+
+    loaded, weights = ns.startup(str(answers), str(sidecar), with_weights=True,
+                                 validate=False)
+    assert loaded == ["3*4+5=17", "10-2*4=2"]
+    assert weights == {"3*4+5=17": 2.5, "10-2*4=2": 4.0}
+
+
+def test_no_weights_means_uniform(tmp_path):
+    answers = tmp_path / "answers.txt"
+    answers.write_text("3*4+5=17\n")
+    assert ns.startup(str(answers), with_weights=True, validate=False) == (["3*4+5=17"], None)
+
+
+def test_zero_mass_prior_is_rejected(tmp_path, capsys):
+    answers = tmp_path / "answers.txt"
+    answers.write_text("3*4+5=17 0\n10-2*4=2 0\n")
+
+    assert ns.startup(str(answers), with_weights=True, validate=False) == ([], None)
+    assert "sum to zero" in capsys.readouterr().err
+
+
+def test_simulate_many_games_with_zero_weights(all_answers, capsys):
+    ns.simulate_many_games(all_answers, 3, weights={eq: 0.0 for eq in all_answers})
+    assert "zero prior weight" in capsys.readouterr().out
+
+
+def test_pick_likely_prefers_heaviest():
+    weights = {"a": 1.0, "b": 3.0, "c": 2.0}
+    assert ns.pick_likely(["a", "b", "c"], weights) == "b"
+
+
+def test_unmatched_sidecar_entries_are_reported(tmp_path, capsys):
+    answers = tmp_path / "answers.txt"
+    answers.write_text("3*4+5=17\n10-2*4=2\n")
+    sidecar = tmp_path / "weights.txt"
+    sidecar.write_text("10-2*4=2 4\r\n3*4+5=18 2\r\n")
+
+    loaded, weights = ns.startup(str(answers), str(sidecar), with_weights=True,
+                                 validate=False)
+    assert weights == {"3*4+5=17": 1.0, "10-2*4=2": 4.0}
+    assert "1 of 2 weights" in capsys.readouterr().err
+
+
+def test_sidecar_matching_nothing_is_no_prior(tmp_path, capsys):
+    answers = tmp_path / "answers.txt"
+    answers.write_text("3*4+5=17\n10-2*4=2\n")
+    sidecar = tmp_path / "weights.txt"
+    sidecar.write_text("3*4+5=18 2\n10-2*4=3 4\n")
+
+    assert ns.startup(str(answers), str(sidecar), with_weights=True,
+                      validate=False) == (["3*4+5=17", "10-2*4=2"], None)
+    assert "(0 matched)" in capsys.readouterr().err